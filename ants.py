@@ -0,0 +1,123 @@
+import numpy as np
+
+# Ant color codes, ordered from weakest to strongest signal
+ANT_COLORS = ["gray", "yellow", "blue", "green"]
+NO_ANT, GRAY, YELLOW, BLUE, GREEN = 0, 1, 2, 3, 4
+
+DEFAULT_ANTS_PARAMS = {
+    "window": 15,
+    "momentum_threshold": 12,
+    "price_threshold": 1.20,
+    "volume_threshold": 1.20
+}
+
+def rolling_sum(values, window):
+    """Trailing rolling sum, NaN until the window is full (like pandas rolling)"""
+    values = np.asarray(values, dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if window <= 0 or len(values) < window:
+        return out
+    csum = np.concatenate(([0.0], np.cumsum(values)))
+    out[window - 1:] = csum[window:] - csum[:-window]
+    return out
+
+def shift(values, periods):
+    """Shift an array forward by `periods`, padding with NaN"""
+    out = np.full(len(values), np.nan)
+    if periods < len(values):
+        out[periods:] = values[:len(values) - periods]
+    return out
+
+def ant_color_codes(close, volume, window=15, momentum_threshold=12,
+                    price_threshold=1.20, volume_threshold=1.20):
+    """Compute Ant color codes (NO_ANT..GREEN) from raw close/volume arrays"""
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+
+    # Momentum: Count days where close > previous close
+    up = np.zeros(len(close))
+    up[1:] = close[1:] > close[:-1]
+    momentum = rolling_sum(up, window)
+
+    # Volume: Compare current window avg volume vs previous window avg volume
+    vol_sma = rolling_sum(volume, window) / window
+    with np.errstate(invalid="ignore", divide="ignore"):
+        volume_met = vol_sma >= volume_threshold * shift(vol_sma, window)
+
+        # Price: close vs close `window` days ago
+        price_met = (close / shift(close, window)) >= price_threshold
+        momentum_met = momentum >= momentum_threshold
+
+    codes = np.zeros(len(close), dtype=np.int8)
+    codes[momentum_met] = GRAY
+    codes[momentum_met & volume_met] = YELLOW
+    codes[momentum_met & price_met] = BLUE
+    codes[momentum_met & price_met & volume_met] = GREEN
+    return codes
+
+def ants_score_arrays(close, volume, period=15, momentum_threshold=12,
+                      price_threshold=1.20, volume_threshold=1.20, long_period=50):
+    """Vectorized Momentum/Price/Volume/Ants Score columns as numpy arrays"""
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    n = len(close)
+
+    up = np.zeros(n)
+    up[1:] = close[1:] > close[:-1]
+    with np.errstate(invalid="ignore"):
+        cond1 = rolling_sum(up, period) >= momentum_threshold
+        cond2 = (rolling_sum(close, period) / period
+                 > price_threshold * rolling_sum(close, long_period) / long_period)
+        cond3 = (rolling_sum(volume, period) / period
+                 > volume_threshold * rolling_sum(volume, long_period) / long_period)
+
+    active = np.arange(n) >= period - 1
+    cond1 &= active
+
+    # A momentum bar marks itself and the preceding `period - 1` bars
+    hits = np.concatenate(([0], np.cumsum(cond1)))
+    ends = np.minimum(np.arange(n) + period, n)
+    momentum = (hits[ends] - hits[:n] > 0).astype(np.int8)
+
+    price = np.where(cond2 & active, 2, 0).astype(np.int8)
+    vol = np.where(cond3 & active, 3, 0).astype(np.int8)
+    score = (cond1.astype(np.int8) + price + vol).astype(np.int8)
+    return momentum, price, vol, score
+
+def calculate_ants_indicator(df, window=15, momentum_threshold=12,
+                             price_threshold=1.20, volume_threshold=1.20):
+    """Add a categorical `ant_color` to a close/volume DataFrame (NaN where no ant)"""
+    import pandas as pd
+
+    df = df.copy()
+    codes = ant_color_codes(
+        df["close"].to_numpy(), df["volume"].to_numpy(),
+        window=window,
+        momentum_threshold=momentum_threshold,
+        price_threshold=price_threshold,
+        volume_threshold=volume_threshold
+    )
+    # Code 0 (no ant) maps to category code -1, i.e. NaN
+    df["ant_color"] = pd.Categorical.from_codes(
+        codes.astype(np.int8) - 1,
+        categories=ANT_COLORS,
+        ordered=True
+    )
+    return df
+
+def calculate_ants_score(df, period=15, price_threshold=1.20, volume_threshold=1.20):
+    """Ants exploration frame (Momentum, Price, Volume, Ants Score) for OHLCV data"""
+    import pandas as pd
+
+    momentum, price, vol, score = ants_score_arrays(
+        df["Close"].to_numpy(), df["Volume"].to_numpy(),
+        period=period,
+        price_threshold=price_threshold,
+        volume_threshold=volume_threshold
+    )
+    return pd.DataFrame({
+        "Momentum": momentum,
+        "Price": price,
+        "Volume": vol,
+        "Ants Score": score
+    }, index=df.index)
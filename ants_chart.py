@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+
+from ants import ANT_COLORS
+
+# Points per series sent to the browser for the visible range
+DEFAULT_MAX_POINTS = 1500
+
+# Ant markers sit just above the close, as in the original scripts
+MARKER_OFFSET = 1.01
+
+def lttb_indices(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: indices of `threshold` points that keep the line's shape"""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    prev = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        # Triangle area between previous pick, each candidate and the next bucket's mean
+        area = np.abs(
+            (x[prev] - avg_x) * (y[start:end] - y[prev])
+            - (x[prev] - x[start:end]) * (avg_y - y[prev])
+        )
+        prev = start + int(np.argmax(area))
+        selected[i + 1] = prev
+    return selected
+
+def minmax_indices(y, n_buckets):
+    """Min and max index of each bucket, so spikes (e.g. volume) survive downsampling"""
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(0, n, n_buckets + 1).astype(int)
+    picks = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        bucket = y[start:end]
+        picks.extend((start + int(np.argmin(bucket)), start + int(np.argmax(bucket))))
+    return np.unique(picks)
+
+def viewport(df, start=None, end=None):
+    """Rows of `df` inside [start, end] (inclusive, open-ended when None)"""
+    return df.loc[start:end] if start is not None or end is not None else df
+
+def downsample_view(df, start=None, end=None, max_points=DEFAULT_MAX_POINTS):
+    """Price (LTTB) and volume (min/max) rows to draw for the visible range"""
+    view = viewport(df, start, end)
+    x = view.index.asi8 if isinstance(view.index, pd.DatetimeIndex) else np.arange(len(view))
+    price = view.iloc[lttb_indices(x, view["close"].to_numpy(), max_points)]
+    volume = view.iloc[minmax_indices(view["volume"].to_numpy(), max_points // 2)]
+    return view, price, volume
+
+def build_ants_figure(df, start=None, end=None, max_points=DEFAULT_MAX_POINTS,
+                      title="Ants Indicator - Interactive Analysis"):
+    """Plotly price/volume figure with one marker trace per ant color.
+
+    `df` is the output of ants.calculate_ants_indicator. Price and volume
+    are downsampled to `max_points` for the visible range; every ant in
+    that range is kept. Uses SVG traces only (no WebGL).
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    view, price, volume = downsample_view(df, start, end, max_points)
+
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True,
+                        vertical_spacing=0.05,
+                        row_heights=[0.7, 0.3])
+
+    fig.add_trace(go.Scatter(
+        x=price.index, y=price["close"],
+        mode="lines", name="Price",
+        line=dict(color="black", width=2)
+    ), row=1, col=1)
+
+    for color in ANT_COLORS:
+        ants = view[view["ant_color"] == color]
+        if ants.empty:
+            continue
+        fig.add_trace(go.Scatter(
+            x=ants.index, y=ants["close"] * MARKER_OFFSET,
+            mode="markers", name=f"{color.capitalize()} Ants",
+            marker=dict(color=color, size=10, line=dict(width=1, color="black")),
+            hovertemplate="Date: %{x}<br>Price: %{y:.2f}<br>Type: %{fullData.name}"
+        ), row=1, col=1)
+
+    fig.add_trace(go.Bar(
+        x=volume.index, y=volume["volume"],
+        name="Volume",
+        marker=dict(color="blue", opacity=0.5)
+    ), row=2, col=1)
+
+    fig.update_layout(
+        title=title,
+        hovermode="x unified",
+        height=800,
+        showlegend=True,
+        xaxis_rangeslider_visible=False
+    )
+    fig.update_yaxes(title_text="Price", row=1, col=1)
+    fig.update_yaxes(title_text="Volume", row=2, col=1)
+    return fig
+
+def plot_ants_matplotlib(price_data, ants_data, max_points=DEFAULT_MAX_POINTS, ax=None):
+    """Static chart: downsampled price line plus one batched scatter per ant color"""
+    import matplotlib.pyplot as plt
+
+    if ax is None:
+        _, ax = plt.subplots(figsize=(14, 7))
+
+    x = price_data.index.asi8 if isinstance(price_data.index, pd.DatetimeIndex) else np.arange(len(price_data))
+    price = price_data.iloc[lttb_indices(x, price_data["close"].to_numpy(), max_points)]
+    ax.plot(price.index, price["close"], label="Price", color="black")
+
+    for color in ANT_COLORS:
+        dates = ants_data.index[ants_data["ant_color"] == color]
+        if len(dates):
+            ax.scatter(dates, price_data.loc[dates, "close"] * MARKER_OFFSET,
+                       color=color, edgecolor="black", s=100,
+                       label=f"{color.capitalize()} Ant")
+
+    ax.set_title("Ants Indicator")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Price")
+    ax.legend()
+    ax.grid(True)
+    return ax
+
+def render_ants_chart(df, key="ants_chart", max_points=DEFAULT_MAX_POINTS):
+    """Streamlit component: date-range zoom that re-downsamples the selected window at full detail"""
+    import streamlit as st
+
+    if df is None or df.empty:
+        st.info("No price history available for the Ants chart")
+        return
+
+    first, last = df.index[0].date(), df.index[-1].date()
+    start, end = st.slider(
+        "Chart range",
+        min_value=first,
+        max_value=last,
+        value=(first, last),
+        key=f"{key}_range",
+        help="Narrow the range to load more detail"
+    )
+    fig = build_ants_figure(df, pd.Timestamp(start), pd.Timestamp(end), max_points)
+    st.plotly_chart(fig, use_container_width=True, key=key)
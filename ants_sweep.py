@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+from ants import ANT_COLORS
+
+DEFAULT_GRID = {
+    "windows": [10, 15, 20],
+    "momentum_cutoffs": [9, 10, 11, 12, 13],
+    "price_thresholds": [1.05, 1.10, 1.15, 1.20, 1.25, 1.30],
+    "volume_thresholds": [1.00, 1.10, 1.20, 1.30, 1.40, 1.50]
+}
+
+def _pad(frames):
+    """Close/volume of each ticker on its own calendar as tail-padded (N, T) arrays.
+
+    Returns close, volume and a validity mask; row i holds ticker i's bars
+    in date order followed by NaN padding up to the longest history.
+    """
+    if isinstance(frames, pd.DataFrame):
+        frames = {"_": frames}
+    frames = [f.sort_index() for f in frames.values()]
+    length = max((len(f) for f in frames), default=0)
+    close = np.full((len(frames), length), np.nan)
+    volume = np.full((len(frames), length), np.nan)
+    valid = np.zeros((len(frames), length), dtype=bool)
+    for i, frame in enumerate(frames):
+        n = len(frame)
+        close[i, :n] = frame["close"].to_numpy(dtype=np.float64)
+        volume[i, :n] = frame["volume"].to_numpy(dtype=np.float64)
+        valid[i, :n] = True
+    return close, volume, valid
+
+def _window_diff(csum, window):
+    """Trailing window sums along the last axis from a zero-prefixed cumsum, NaN until full"""
+    out = np.full(csum[..., 1:].shape, np.nan)
+    out[..., window - 1:] = csum[..., window:] - csum[..., :-window]
+    return out
+
+def _shift(values, periods):
+    out = np.full(values.shape, np.nan)
+    out[..., periods:] = values[..., :-periods]
+    return out
+
+def sweep_ants(frames, windows=None, momentum_cutoffs=None, price_thresholds=None,
+               volume_thresholds=None, horizon=10):
+    """Evaluate an Ants parameter grid over one or many tickers in one broadcast pass.
+
+    `frames` is a close/volume DataFrame or a {ticker: DataFrame} dict. For
+    every (window, momentum cutoff, price threshold, volume threshold) the
+    result has the number of ants of each color and the mean and hit rate
+    (share > 0) of the `horizon`-bar forward return after those ants,
+    pooled over all tickers (ants in the last `horizon` bars are counted
+    but have no forward return). Every ticker is evaluated on its own bars,
+    as ants.ant_color_codes would; histories of different lengths are
+    padded at the tail and masked. Cumulative sums are computed once and each
+    window is a single difference of them; the threshold grid is then
+    evaluated as matrix products over (ticker, bar) instead of a loop.
+    """
+    grid = {
+        "windows": windows,
+        "momentum_cutoffs": momentum_cutoffs,
+        "price_thresholds": price_thresholds,
+        "volume_thresholds": volume_thresholds
+    }
+    grid = {name: DEFAULT_GRID[name] if values is None else values for name, values in grid.items()}
+    windows = [int(w) for w in grid["windows"]]
+    momentum_cutoffs = np.asarray(grid["momentum_cutoffs"], dtype=np.float64)
+    price_thresholds = np.asarray(grid["price_thresholds"], dtype=np.float64)
+    volume_thresholds = np.asarray(grid["volume_thresholds"], dtype=np.float64)
+
+    close, volume, valid_bar = _pad(frames)
+
+    # Shared across every window
+    up = np.zeros(close.shape)
+    up[:, 1:] = close[:, 1:] > close[:, :-1]
+    zeros = np.zeros((close.shape[0], 1))
+    up_csum = np.concatenate((zeros, np.cumsum(up, axis=1)), axis=1)
+    vol_csum = np.concatenate((zeros, np.cumsum(np.nan_to_num(volume), axis=1)), axis=1)
+
+    forward = np.full(close.shape, np.nan)
+    forward[:, :-horizon] = close[:, horizon:] / close[:, :-horizon] - 1
+    valid = np.isfinite(forward)
+    forward = np.where(valid, forward, 0.0).reshape(-1)
+    wins = (forward > 0).astype(np.float32)
+    has_return = valid.reshape(-1).astype(np.float32)
+
+    n_m, n_p, n_v = len(momentum_cutoffs), len(price_thresholds), len(volume_thresholds)
+    rows = []
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for window in windows:
+            momentum = _window_diff(up_csum, window)
+            vol_sma = _window_diff(vol_csum, window) / window
+            price_ratio = close / _shift(close, window)
+            vol_ratio = vol_sma / _shift(vol_sma, window)
+
+            # (cutoffs, ticker*bar) indicator matrices
+            mom = (momentum >= momentum_cutoffs[:, None, None]) & valid_bar
+            price = price_ratio[None] >= price_thresholds[:, None, None]
+            vol = (vol_ratio[None] >= volume_thresholds[:, None, None]).reshape(n_v, -1).astype(np.float32)
+
+            # Momentum & price (and momentum & not price) for every (m, p) pair
+            mp = (mom[:, None] & price[None]).reshape(n_m * n_p, -1).astype(np.float32)
+            mnp = (mom[:, None] & ~price[None]).reshape(n_m * n_p, -1).astype(np.float32)
+
+            stats = {}
+            for base, colors in ((mp, ("blue", "green")), (mnp, ("gray", "yellow"))):
+                for weights, name in ((None, "count"), (has_return, "with_return"),
+                                      (forward, "return_sum"), (wins, "wins")):
+                    weighted = base if weights is None else base * weights
+                    with_vol = weighted @ vol.T
+                    total = weighted.sum(axis=1, dtype=np.float64)[:, None]
+                    stats[(colors[0], name)] = total - with_vol  # volume condition not met
+                    stats[(colors[1], name)] = with_vol
+
+            for flat, (m, p) in enumerate(np.ndindex(n_m, n_p)):
+                for v in range(n_v):
+                    row = {
+                        "window": window,
+                        "momentum_cutoff": momentum_cutoffs[m],
+                        "price_threshold": price_thresholds[p],
+                        "volume_threshold": volume_thresholds[v]
+                    }
+                    for color in ANT_COLORS:
+                        row[f"{color}_count"] = int(round(stats[(color, "count")][flat, v]))
+                        with_return = stats[(color, "with_return")][flat, v]
+                        row[f"{color}_mean_return"] = (stats[(color, "return_sum")][flat, v] / with_return
+                                                       if with_return else np.nan)
+                        row[f"{color}_hit_rate"] = (stats[(color, "wins")][flat, v] / with_return
+                                                    if with_return else np.nan)
+                    rows.append(row)
+
+    results = pd.DataFrame(rows)
+    if results.empty:
+        return results
+    results["window"] = results["window"].astype(np.int16)
+    for column in ("momentum_cutoff", "price_threshold", "volume_threshold"):
+        results[column] = results[column].astype(np.float32)
+    for color in ANT_COLORS:
+        results[f"{color}_count"] = results[f"{color}_count"].astype(np.int32)
+    return results
+
+def main():
+    import argparse
+    import time
+    from api_handler import get_daily_history
+    from scheduler import BATCH, request_context
+
+    parser = argparse.ArgumentParser(description="Ants parameter sweep over one or many tickers")
+    parser.add_argument("tickers", nargs="+")
+    parser.add_argument("--horizon", type=int, default=10)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    with request_context(BATCH, owner="ants_sweep"):
+        frames = {t: get_daily_history(t) for t in args.tickers}
+    frames = {t: f for t, f in frames.items() if f is not None}
+
+    start = time.perf_counter()
+    results = sweep_ants(frames, horizon=args.horizon)
+    elapsed = time.perf_counter() - start
+
+    print(results.sort_values("green_mean_return", ascending=False).head(args.top).to_string(index=False))
+    print(f"{len(results)} combinations over {len(frames)} tickers in {elapsed:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,210 @@
-import requests
-import pandas as pd
+import threading
 import time
-from config import API_CONFIG, ALPHA_VANTAGE_API_KEY_PREMIUM, FINNHUB_API_KEY
+from collections import defaultdict, deque
+import config
+from config import (API_CONFIG, BREAKER_COOLDOWN, BREAKER_FAILURE_THRESHOLD, CACHE_EXPIRATION,
+                    CACHE_REFRESH_AHEAD, NEGATIVE_CACHE_TTL)
+from circuit_breaker import INVALID_SYMBOL, SERVER_ERROR, THROTTLE, TRANSIENT, UNAVAILABLE, CircuitBreaker
+from scheduler import PREFETCH, DeadlineExceeded, KeyBudget, RequestCancelled, RequestScheduler, current_context
+
+# In-process response cache: (ticker, function, params) -> (expires_at, data)
+_response_cache = {}
+_cache_lock = threading.Lock()
+
+# Recent non-prefetch accesses per ticker (time.time() values) and last throttle seen
+ACCESS_WINDOW = 3600
+_ticker_access = defaultdict(deque)
+_last_throttle = [0.0]
+
+# Failing symbols/endpoints fail fast instead of waiting on the scheduler
+breaker = CircuitBreaker(NEGATIVE_CACHE_TTL, BREAKER_FAILURE_THRESHOLD, BREAKER_COOLDOWN)
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    """Shared request scheduler with one budget per configured Alpha Vantage key"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            settings = API_CONFIG["alpha_vantage"]
+            budgets = [
+                KeyBudget(name, getattr(config, name), limit, premium=name in settings["premium_keys"])
+                for name, limit in settings["key_rate_limits"].items()
+                if getattr(config, name, None)
+            ]
+            _scheduler = RequestScheduler(budgets)
+        return _scheduler
+
+def is_throttled(data):
+    """True for Alpha Vantage's 200-status rate limit responses"""
+    if not isinstance(data, dict):
+        return False
+    message = str(data.get("Note") or data.get("Information") or "").lower()
+    return "call frequency" in message or "rate limit" in message
+
+def is_premium_request(params):
+    """True for requests only premium keys can serve"""
+    return params.get("outputsize") == "full"
+
+# Key holding the data of a response, for the functions whose key is known.
+# Core time-series calls fail for the symbol as a whole; anything else fails
+# only for its own endpoint.
+DATA_KEYS = {
+    "TIME_SERIES_DAILY": "Time Series (Daily)",
+    "TIME_SERIES_DAILY_ADJUSTED": "Time Series (Daily)",
+    "TIME_SERIES_WEEKLY": "Weekly Time Series",
+    "TIME_SERIES_WEEKLY_ADJUSTED": "Weekly Adjusted Time Series",
+    "TIME_SERIES_MONTHLY": "Monthly Time Series",
+    "TIME_SERIES_MONTHLY_ADJUSTED": "Monthly Adjusted Time Series",
+    "GLOBAL_QUOTE": "Global Quote"
+}
+CORE_FUNCTIONS = set(DATA_KEYS)
+TECHNICAL_INDICATORS = {"SMA", "EMA", "AROON", "MFI", "RSI", "MACDEXT"}
+
+def data_key(function):
+    """Data key of `function`'s responses, or None if it is not known"""
+    if function in TECHNICAL_INDICATORS:
+        return f"Technical Analysis: {function}"
+    return DATA_KEYS.get(function)
+
+def classify_response(data, function=None):
+    """Failure class of a decoded Alpha Vantage response, or None if it looks valid.
+
+    An "Error Message" or empty response is INVALID_SYMBOL for core
+    time-series calls (and when `function` is not given) and UNAVAILABLE
+    for the endpoint otherwise. For functions with a known data key, a
+    response without it is a failure: an Information/Note message (e.g. a
+    premium endpoint notice) is UNAVAILABLE, anything else a SERVER_ERROR.
+    """
+    if not isinstance(data, dict):
+        return SERVER_ERROR
+    if is_throttled(data):
+        return THROTTLE
+    if "Error Message" in data or not data:
+        return INVALID_SYMBOL if function is None or function in CORE_FUNCTIONS else UNAVAILABLE
+    key = data_key(function)
+    if key is None or key in data:
+        return None
+    if "Information" in data or "Note" in data:
+        return UNAVAILABLE
+    return SERVER_ERROR
+
+def classify_exception(error):
+    """Failure class of a requests exception"""
+    import requests
+
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        if status == 429:
+            return THROTTLE
+        if status >= 500:
+            return SERVER_ERROR
+    if isinstance(error, ValueError):
+        return SERVER_ERROR  # Undecodable body
+    return TRANSIENT
+
+def last_throttle_time():
+    """time.time() of the most recent throttle response (0.0 if none)"""
+    return _last_throttle[0]
+
+def _record_failure(ticker, endpoint, failure):
+    """Track a failed call; throttles, HTTP 429 or 200-status Note alike, also mark the key"""
+    if failure == THROTTLE:
+        _last_throttle[0] = time.time()
+    breaker.record_failure(ticker, endpoint, failure)
+
+def _record_access(ticker):
+    now = time.time()
+    with _cache_lock:
+        accesses = _ticker_access[ticker]
+        accesses.append(now)
+        while accesses and now - accesses[0] > ACCESS_WINDOW:
+            accesses.popleft()
+
+def access_count(ticker):
+    """Non-prefetch requests for `ticker` in the last ACCESS_WINDOW seconds"""
+    now = time.time()
+    with _cache_lock:
+        return sum(1 for t in _ticker_access.get(ticker, ()) if now - t <= ACCESS_WINDOW)
+
+def cache_expiry(ticker):
+    """Earliest expiry time of the cached responses for `ticker` (None if nothing cached)"""
+    with _cache_lock:
+        expiries = [expires for (symbol, _, _), (expires, _) in _response_cache.items() if symbol == ticker]
+    return min(expiries) if expiries else None
 
-# Rate limiting decorator
-def rate_limited(max_per_minute):
-    min_interval = 60.0 / max_per_minute
-    
-    def decorate(func):
-        last_time_called = [0.0]
-        
-        def rate_limited_function(*args, **kwargs):
-            elapsed = time.time() - last_time_called[0]
-            wait = min_interval - elapsed
-            if wait > 0:
-                time.sleep(wait)
-            last_time_called[0] = time.time()
-            return func(*args, **kwargs)
-        return rate_limited_function
-    return decorate
-
-@rate_limited(API_CONFIG["alpha_vantage"]["rate_limit"])
 def get_alpha_vantage_data(ticker, function="TIME_SERIES_DAILY", **params):
-    """Generic Alpha Vantage API fetcher with error handling"""
+    """Generic Alpha Vantage API fetcher with error handling.
+
+    Responses carrying the function's data are cached for CACHE_EXPIRATION
+    seconds (notices and other payloads without it never are); prefetch
+    requests treat entries within CACHE_REFRESH_AHEAD of expiry as stale so
+    the warmer refreshes them before users see a miss. Failures are
+    classified, negatively cached and tracked by the circuit breaker, and
+    return None (immediately while the symbol/endpoint is blocked). Calls
+    are admitted by the shared scheduler using the priority, owner,
+    deadline and cancel event of the caller's scheduler.request_context;
+    RequestCancelled and DeadlineExceeded propagate to the caller.
+    """
+    context = current_context()
+    refresh_ahead = 0
+    if context["priority"] == PREFETCH:
+        refresh_ahead = CACHE_REFRESH_AHEAD
+    else:
+        _record_access(ticker)
+
+    cache_key = (ticker, function, tuple(sorted(params.items())))
+    with _cache_lock:
+        cached = _response_cache.get(cache_key)
+    if cached and cached[0] > time.time() + refresh_ahead:
+        return cached[1]
+
+    # Premium-only variants are tracked apart so their failures never block the basic call
+    premium = is_premium_request(params)
+    endpoint = f"{function} (premium)" if premium else function
+    reason = breaker.blocked(ticker, endpoint)
+    if reason:
+        print(f"Skipping {function} for {ticker}: {reason}")
+        return None
+
+    try:
+        api_key = get_scheduler().acquire(**context, premium=premium)
+    except Exception:
+        breaker.release(ticker, endpoint)
+        raise
+
+    import requests
+
     base_params = {
         "function": function,
         "symbol": ticker,
         "datatype": "json",
-        "apikey": ALPHA_VANTAGE_API_KEY_PREMIUM
+        "apikey": api_key
     }
     base_params.update(params)
     
     try:
         response = requests.get(API_CONFIG["alpha_vantage"]["base_url"], params=base_params)
         response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching {function} for {ticker}: {str(e)}")
+        data = response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        failure = classify_exception(e)
+        _record_failure(ticker, endpoint, failure)
+        print(f"Error fetching {function} for {ticker} ({failure}): {str(e)}")
         return None
 
+    failure = classify_response(data, function)
+    if failure:
+        _record_failure(ticker, endpoint, failure)
+        print(f"Error fetching {function} for {ticker} ({failure})")
+        return None
+
+    breaker.record_success(ticker, endpoint)
+    with _cache_lock:
+        _response_cache[cache_key] = (time.time() + CACHE_EXPIRATION, data)
+    return data
+
 def get_moving_averages(ticker):
     """Fetch SMA and EMA values for 15, 45, and 50-day periods"""
     ma_values = {}
@@ -84,10 +250,40 @@ def get_ohlcv_data(ticker, source="alpha_vantage"):
                 "Volume": int(ohlc_data["5. volume"])
             }
             
+    except (RequestCancelled, DeadlineExceeded):
+        raise
     except Exception as e:
         print(f"Error fetching OHLCV data for {ticker}: {str(e)}")
         return None
 
+def get_daily_history(ticker, outputsize="full"):
+    """Fetch the daily close/volume history as an ascending DataFrame"""
+    import pandas as pd
+
+    data = get_alpha_vantage_data(ticker, outputsize=outputsize)
+    if not data:
+        return None
+
+    time_series = data.get("Time Series (Daily)", {})
+    if not time_series:
+        print(f"No time series data found for {ticker}")
+        return None
+
+    try:
+        df = pd.DataFrame.from_dict(time_series, orient="index", dtype=float)
+        df.index = pd.to_datetime(df.index)
+        df = df.rename(columns={
+            "1. open": "open",
+            "2. high": "high",
+            "3. low": "low",
+            "4. close": "close",
+            "5. volume": "volume"
+        })
+        return df.sort_index()[["open", "high", "low", "close", "volume"]]
+    except Exception as e:
+        print(f"Error building daily history for {ticker}: {str(e)}")
+        return None
+
 def calculate_52weekhigh(ticker):
     """Calculate 52-week high percentage with caching"""
     weekly_data = get_alpha_vantage_data(ticker, function="TIME_SERIES_WEEKLY")
@@ -111,6 +307,8 @@ def calculate_52weekhigh(ticker):
         current_close = float(time_series[latest_date]["4. close"])
         
         return ((current_close - fifty_two_week_high) / fifty_two_week_high) * 100
+    except (RequestCancelled, DeadlineExceeded):
+        raise
     except Exception as e:
         print(f"Error calculating 52-week high for {ticker}: {str(e)}")
         return None
@@ -175,140 +373,147 @@ def get_rsi_indicators(ticker, time_period=14):
     
     return rsi_values
    
-def get_technical_indicators(ticker, source="alpha_vantage"):
-    """Fetch all technical indicators with exact quarterly and indicator calculations"""
-    indicators = {}
+def get_close_lookbacks(ticker):
+    """Historical close prices Close-1 .. Close-24 from daily data"""
+    daily_data = get_alpha_vantage_data(ticker)
+    if not daily_data:
+        raise ValueError("No daily price data available")
+        
+    time_series = daily_data.get("Time Series (Daily)", {})
+    if not time_series:
+        raise ValueError("Empty time series data")
     
-    try:
-        if source != "alpha_vantage":
-            raise ValueError("Only alpha_vantage source is currently supported")
+    # Convert to sorted list of (date, values) pairs
+    sorted_daily = sorted(time_series.items(), key=lambda x: x[0], reverse=True)
+    
+    # Add historical close prices (up to 24 days back)
+    close_lookbacks = {f"Close-{i}": None for i in range(25)}
+    close_lookbacks.pop("Close-0")  # We already have current close
+    
+    for i in range(1, 25):
+        if i < len(sorted_daily):
+            close_lookbacks[f"Close-{i}"] = float(sorted_daily[i][1]["4. close"])
+    
+    return close_lookbacks
+
+def get_52weekhigh(ticker):
+    """52-week high percentage as an indicator dict"""
+    return {"52weekhigh": calculate_52weekhigh(ticker)}
+
+def get_macd_indicators(ticker):
+    """Daily/weekly/monthly MACD plus quarterly average and indicator totals"""
+    indicators = {}
+    macd_data = {}
+    for timeframe in ["daily", "weekly", "monthly"]:
+        data = get_alpha_vantage_data(
+            ticker,
+            function="MACDEXT",
+            interval=timeframe,
+            series_type="close",
+            fastperiod=12,
+            slowperiod=26,
+            signalperiod=9,
+            fastmatype=1,
+            slowmatype=1,
+            signalmatype=1
+        )
         
-        # 1. Get daily OHLCV data for historical closes
-        daily_data = get_alpha_vantage_data(ticker)
-        if not daily_data:
-            raise ValueError("No daily price data available")
+        if not data:
+            continue
             
-        time_series = daily_data.get("Time Series (Daily)", {})
-        if not time_series:
-            raise ValueError("Empty time series data")
-        
-        # Convert to sorted list of (date, values) pairs
-        sorted_daily = sorted(time_series.items(), key=lambda x: x[0], reverse=True)
-        
-        # 2. Add historical close prices (up to 24 days back)
-        close_lookbacks = {f"Close-{i}": None for i in range(25)}
-        close_lookbacks.pop("Close-0")  # We already have current close
-        
-        for i in range(1, 25):
-            if i < len(sorted_daily):
-                close_lookbacks[f"Close-{i}"] = float(sorted_daily[i][1]["4. close"])
-        
-        indicators.update(close_lookbacks)
-        
-        # 3. Get moving averages (SMA and EMA)
-        moving_averages = get_moving_averages(ticker)
-        indicators.update(moving_averages)
-        
-        # 4. Get 52-week high
-        indicators["52weekhigh"] = calculate_52weekhigh(ticker)
-        
-        # 5. Get Aroon indicators
-        aroon_indicators = get_aroon_indicators(ticker)
-        indicators.update(aroon_indicators)
-        
-        # 6. Get MFI indicator
-        mfi_indicator = get_mfa_indicator(ticker)
-        indicators.update(mfi_indicator)
-        
-        # 7. Get RSI indicator
-        rsi_indicators = get_rsi_indicators(ticker)
-        indicators.update(rsi_indicators)
-        
-        # MACD Calculations
-        macd_data = {}
-        for timeframe in ["daily", "weekly", "monthly"]:
-            data = get_alpha_vantage_data(
-                ticker,
-                function="MACDEXT",
-                interval=timeframe,
-                series_type="close",
-                fastperiod=12,
-                slowperiod=26,
-                signalperiod=9,
-                fastmatype=1,
-                slowmatype=1,
-                signalmatype=1
-            )
+        tech_key = f"Technical Analysis: MACDEXT"
+        tech_data = data.get(tech_key, {})
+        if not tech_data:
+            continue
             
-            if not data:
-                continue
-                
-            tech_key = f"Technical Analysis: MACDEXT"
-            tech_data = data.get(tech_key, {})
-            if not tech_data:
-                continue
-                
-            # Store all monthly data points for quarterly calculation
-            if timeframe == "monthly":
-                monthly_points = []
-                for date, values in list(tech_data.items())[:3]:  # Last 3 months
-                    try:
-                        monthly_points.append({
-                            "macd": float(values["MACD"]),
-                            "signal": float(values["MACD_Signal"])
-                        })
-                    except (KeyError, ValueError):
-                        continue
-                
-                if monthly_points:
-                    macd_data["monthly_points"] = monthly_points
+        # Store all monthly data points for quarterly calculation
+        if timeframe == "monthly":
+            monthly_points = []
+            for date, values in list(tech_data.items())[:3]:  # Last 3 months
+                try:
+                    monthly_points.append({
+                        "macd": float(values["MACD"]),
+                        "signal": float(values["MACD_Signal"])
+                    })
+                except (KeyError, ValueError):
+                    continue
             
-            # Get the latest data point
-            if not tech_data:
-                continue
-                
-            latest_date = next(iter(tech_data))
-            prefix = timeframe.capitalize()
+            if monthly_points:
+                macd_data["monthly_points"] = monthly_points
+        
+        # Get the latest data point
+        if not tech_data:
+            continue
             
-            try:
-                macd_value = float(tech_data[latest_date]["MACD"])
-                signal_value = float(tech_data[latest_date]["MACD_Signal"])
-                
-                indicators.update({
-                    f"macd{prefix}": macd_value,
-                    f"macdSignal{prefix}": signal_value,
-                    f"macdIndicator{prefix}": 1 if macd_value > signal_value else 0
-                })
-            except (KeyError, ValueError):
-                continue
+        latest_date = next(iter(tech_data))
+        prefix = timeframe.capitalize()
         
-        # Calculate quarterly from last 3 months
-        if "monthly_points" in macd_data and len(macd_data["monthly_points"]) >= 3:
-            last_3_months = macd_data["monthly_points"][:3]
-            quarterly_macd = sum(p["macd"] for p in last_3_months) / 3
-            quarterly_signal = sum(p["signal"] for p in last_3_months) / 3
+        try:
+            macd_value = float(tech_data[latest_date]["MACD"])
+            signal_value = float(tech_data[latest_date]["MACD_Signal"])
             
             indicators.update({
-                "macdQuarterly": quarterly_macd,
-                "macdSignalQuarterly": quarterly_signal,
-                "macdIndicatorQuarterly": 1 if quarterly_macd > quarterly_signal else 0
+                f"macd{prefix}": macd_value,
+                f"macdSignal{prefix}": signal_value,
+                f"macdIndicator{prefix}": 1 if macd_value > signal_value else 0
             })
+        except (KeyError, ValueError):
+            continue
+    
+    # Calculate quarterly from last 3 months
+    if "monthly_points" in macd_data and len(macd_data["monthly_points"]) >= 3:
+        last_3_months = macd_data["monthly_points"][:3]
+        quarterly_macd = sum(p["macd"] for p in last_3_months) / 3
+        quarterly_signal = sum(p["signal"] for p in last_3_months) / 3
         
-        # Calculate totals using only strict 1/0 indicators
-        macd_indicators = [
-            indicators.get("macdIndicatorDaily"),
-            indicators.get("macdIndicatorWeekly"),
-            indicators.get("macdIndicatorMonthly"),
-            indicators.get("macdIndicatorQuarterly")
-        ]
+        indicators.update({
+            "macdQuarterly": quarterly_macd,
+            "macdSignalQuarterly": quarterly_signal,
+            "macdIndicatorQuarterly": 1 if quarterly_macd > quarterly_signal else 0
+        })
+    
+    # Calculate totals using only strict 1/0 indicators
+    macd_indicators = [
+        indicators.get("macdIndicatorDaily"),
+        indicators.get("macdIndicatorWeekly"),
+        indicators.get("macdIndicatorMonthly"),
+        indicators.get("macdIndicatorQuarterly")
+    ]
+    
+    # Count only valid indicators (not None)
+    valid_indicators = [i for i in macd_indicators if i is not None]
+    indicators["macdCount"] = sum(1 for i in valid_indicators if i == 1)
+    indicators["macdTotal"] = len(valid_indicators)
+    
+    return indicators
+
+# Indicator groups in display order; each stage returns a dict of indicators.
+# get_technical_indicators runs them in sequence, the progressive UI concurrently.
+INDICATOR_STAGES = [
+    ("Close lookbacks", get_close_lookbacks),
+    ("Moving averages", get_moving_averages),
+    ("52-week high", get_52weekhigh),
+    ("Aroon", get_aroon_indicators),
+    ("MFI", get_mfa_indicator),
+    ("RSI", get_rsi_indicators),
+    ("MACD", get_macd_indicators)
+]
+
+def get_technical_indicators(ticker, source="alpha_vantage"):
+    """Fetch all technical indicators with exact quarterly and indicator calculations"""
+    indicators = {}
+    
+    try:
+        if source != "alpha_vantage":
+            raise ValueError("Only alpha_vantage source is currently supported")
         
-        # Count only valid indicators (not None)
-        valid_indicators = [i for i in macd_indicators if i is not None]
-        indicators["macdCount"] = sum(1 for i in valid_indicators if i == 1)
-        indicators["macdTotal"] = len(valid_indicators)
+        for _, stage in INDICATOR_STAGES:
+            indicators.update(stage(ticker))
         
         return indicators
         
+    except (RequestCancelled, DeadlineExceeded):
+        raise
     except Exception as e:
         print(f"Error in get_technical_indicators for {ticker}: {str(e)}")
-        return indicators  # Return whatever we have so far
\ No newline at end of file
+        return indicators  # Return whatever we have so far
@@ -0,0 +1,159 @@
+import threading
+import time
+
+from api_handler import (access_count, cache_expiry, get_ohlcv_data, get_scheduler,
+                         get_technical_indicators, last_throttle_time)
+from config import (CACHE_REFRESH_AHEAD, WARMER_INTERVAL, WARMER_MIN_SPARE,
+                    WARMER_THROTTLE_BACKOFF)
+from scheduler import PREFETCH, request_context
+from tickers import TICKERS
+
+# Readiness states shown in the UI
+PENDING, WARMING, READY, FAILED, THROTTLED, STALE = (
+    "pending", "warming", "ready", "failed", "throttled", "stale"
+)
+
+class CacheWarmer:
+    """Background thread that keeps the api_handler cache warm for the ticker universe.
+
+    Sectors are refreshed one at a time, hottest first; within a sector the
+    most frequently accessed tickers closest to expiry go first. Calls run at
+    prefetch priority and only while the scheduler reports spare budget,
+    and a pass stops as soon as a throttle response is seen.
+    """
+
+    def __init__(self, tickers=None, source="alpha_vantage", min_spare=WARMER_MIN_SPARE,
+                 interval=WARMER_INTERVAL, throttle_backoff=WARMER_THROTTLE_BACKOFF, warm=None):
+        self.tickers = tickers or TICKERS
+        self.source = source
+        self.min_spare = min_spare
+        self.interval = interval
+        self.throttle_backoff = throttle_backoff
+        self._warm = warm or self._warm_cache
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._status = {
+            ticker: {"sector": sector, "state": PENDING, "updated": None}
+            for sector, symbols in self.tickers.items() for ticker in symbols
+        }
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run_forever, name="cache-warmer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _set_state(self, ticker, state):
+        with self._lock:
+            self._status[ticker].update(state=state, updated=time.time())
+
+    def status(self):
+        """Per-ticker readiness: {ticker: {"sector", "state", "updated", "expires"}}"""
+        now = time.time()
+        with self._lock:
+            snapshot = {ticker: dict(info) for ticker, info in self._status.items()}
+        for ticker, info in snapshot.items():
+            info["expires"] = cache_expiry(ticker)
+            if info["state"] == READY and (info["expires"] is None or info["expires"] <= now):
+                info["state"] = STALE
+        return snapshot
+
+    def _urgency(self, ticker, now):
+        """Higher for tickers that are accessed often and expire soon"""
+        expires = cache_expiry(ticker)
+        time_to_expiry = max(0.0, expires - now) if expires else 0.0
+        return (1 + access_count(ticker)) / (1 + time_to_expiry / 60.0)
+
+    def _needs_refresh(self, ticker, now):
+        expires = cache_expiry(ticker)
+        return expires is None or expires - now <= CACHE_REFRESH_AHEAD
+
+    def _plan(self):
+        """Sectors and their tickers in warm-up order"""
+        now = time.time()
+        plan = []
+        for sector, symbols in self.tickers.items():
+            ordered = sorted(symbols, key=lambda t: self._urgency(t, now), reverse=True)
+            plan.append((max(self._urgency(t, now) for t in ordered), sector, ordered))
+        plan.sort(key=lambda p: p[0], reverse=True)
+        return [(sector, ordered) for _, sector, ordered in plan]
+
+    def _wait_for_spare_budget(self):
+        scheduler = get_scheduler()
+        while not self._stop.is_set() and scheduler.spare_capacity() < self.min_spare:
+            self._stop.wait(1.0)
+        return not self._stop.is_set()
+
+    def _warm_cache(self, ticker):
+        """Fetch everything the verification view needs; True on success"""
+        ohlcv = get_ohlcv_data(ticker, self.source)
+        if not ohlcv:
+            return False
+        get_technical_indicators(ticker, self.source)
+        return True
+
+    def run_once(self):
+        """One pass over the universe; returns False if it stopped on a throttle"""
+        for sector, symbols in self._plan():
+            for ticker in symbols:
+                now = time.time()
+                if not self._needs_refresh(ticker, now):
+                    self._set_state(ticker, READY)
+                    continue
+                if not self._wait_for_spare_budget():
+                    return True
+
+                self._set_state(ticker, WARMING)
+                throttled_before = last_throttle_time()
+                try:
+                    with request_context(PREFETCH, owner="cache-warmer", cancel_event=self._stop):
+                        ok = self._warm(ticker)
+                except Exception as e:
+                    print(f"Cache warmer failed for {ticker}: {str(e)}")
+                    ok = False
+
+                if last_throttle_time() != throttled_before:
+                    self._set_state(ticker, THROTTLED)
+                    print(f"Cache warmer throttled in {sector} at {ticker}; backing off")
+                    return False
+                self._set_state(ticker, READY if ok else FAILED)
+        return True
+
+    def run_forever(self):
+        while not self._stop.is_set():
+            completed = self.run_once()
+            self._stop.wait(self.interval if completed else self.throttle_backoff)
+
+def main():
+    """Run the warmer as a daemon that persists warmed tickers to the snapshot store.
+
+    Only (ticker, as_of) rows that materialize.py has not written yet are
+    filled in; the post-close snapshot is never overwritten.
+    """
+    from materialize import connect, last_market_close, materialize_ticker, save_snapshot
+
+    conn = connect()
+    sectors = {ticker: sector for sector, symbols in TICKERS.items() for ticker in symbols}
+
+    def warm_and_persist(ticker):
+        record = materialize_ticker(ticker)
+        if record is None:
+            return False
+        save_snapshot(conn, ticker, last_market_close(), record, sectors.get(ticker), replace=False)
+        return True
+
+    warmer = CacheWarmer(warm=warm_and_persist)
+    try:
+        warmer.run_forever()
+    except KeyboardInterrupt:
+        warmer.stop()
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import threading
+import time
+
+# Failure classes
+INVALID_SYMBOL = "invalid_symbol"
+THROTTLE = "throttle"
+TRANSIENT = "transient"
+SERVER_ERROR = "server_error"
+UNAVAILABLE = "unavailable"  # endpoint/parameters not available, e.g. premium-only or rejected
+
+# Breaker states
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+class CircuitBreaker:
+    """Negative cache and per-(symbol, endpoint) circuit breaker for failing fetches.
+
+    Every failure is negatively cached for the TTL of its class; invalid
+    symbols are cached for the symbol as a whole, other classes per
+    endpoint. Consecutive non-throttle failures of one (symbol, endpoint)
+    open its breaker for `cooldown` seconds, after which a single trial
+    call is let through (half-open) to decide whether to close it again.
+    Throttles are key-wide rather than the symbol's fault, so they are
+    only negatively cached and never trip a breaker.
+    """
+
+    def __init__(self, ttls, failure_threshold=3, cooldown=300):
+        self.ttls = ttls
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._negative = {}  # (symbol, endpoint or None) -> (expires_at, failure class)
+        self._failures = {}  # (symbol, endpoint) -> consecutive failures
+        self._open_until = {}  # (symbol, endpoint) -> time the breaker may half-open
+        self._trials = set()  # (symbol, endpoint) with a half-open trial in flight
+
+    def blocked(self, symbol, endpoint):
+        """Reason to fail fast (a failure class or OPEN), or None if the call may proceed"""
+        now = time.time()
+        key = (symbol, endpoint)
+        with self._lock:
+            for negative_key in ((symbol, None), key):
+                entry = self._negative.get(negative_key)
+                if entry and entry[0] > now:
+                    return entry[1]
+
+            open_until = self._open_until.get(key)
+            if open_until is None:
+                return None
+            if now < open_until or key in self._trials:
+                return OPEN
+            self._trials.add(key)
+            return None
+
+    def record_failure(self, symbol, endpoint, failure_class):
+        now = time.time()
+        key = (symbol, endpoint)
+        negative_key = (symbol, None) if failure_class == INVALID_SYMBOL else key
+        with self._lock:
+            self._negative[negative_key] = (now + self.ttls[failure_class], failure_class)
+            trial = key in self._trials
+            self._trials.discard(key)
+            if failure_class == THROTTLE:
+                return
+            self._failures[key] = self._failures.get(key, 0) + 1
+            if trial or self._failures[key] >= self.failure_threshold:
+                self._open_until[key] = now + self.cooldown
+
+    def release(self, symbol, endpoint):
+        """Give back a half-open trial that never reached the API (e.g. cancelled)"""
+        with self._lock:
+            self._trials.discard((symbol, endpoint))
+
+    def record_success(self, symbol, endpoint):
+        key = (symbol, endpoint)
+        with self._lock:
+            self._failures.pop(key, None)
+            self._open_until.pop(key, None)
+            self._negative.pop(key, None)
+            self._trials.discard(key)
+
+    def state(self, symbol, endpoint):
+        key = (symbol, endpoint)
+        with self._lock:
+            open_until = self._open_until.get(key)
+            if open_until is None:
+                return CLOSED
+            return OPEN if time.time() < open_until else HALF_OPEN
@@ -1,21 +1,51 @@
 import os
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Settings read from the environment (and .env) on first access rather than
+# at import time: attribute -> (environment variable, default, converter)
+ENV_SETTINGS = {
+    # API Configuration
+    "ALPHA_VANTAGE_API_KEY": ("ALPHA_VANTAGE_API_KEY", None, str),
+    "ALPHA_VANTAGE_API_KEY_PREMIUM": ("ALPHA_VANTAGE_API_KEY_PREMIUM", None, str),
+    "FINNHUB_API_KEY": ("FINNHUB_API_KEY", None, str),
+    "TWELVE_DATA_API_KEY": ("TWELVE_DATA_API_KEY", None, str),
+    # Background cache warmer (see cache_warmer.py)
+    "WARMER_ENABLED": ("GHOST_WARMER_ENABLED", True, lambda v: v == "1"),
+    # Materialized indicator snapshots (see materialize.py)
+    "SNAPSHOT_DB": ("GHOST_SNAPSHOT_DB", "snapshots.db", str),
+    # Partitioned Parquet/Arrow exports (see export.py)
+    "EXPORT_DIR": ("GHOST_EXPORT_DIR", "exports", str)
+}
+_env_loaded = False
+
+def load_env():
+    """Load environment variables from .env once"""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
 
-# API Configuration
-ALPHA_VANTAGE_API_KEY = os.getenv("ALPHA_VANTAGE_API_KEY")
-ALPHA_VANTAGE_API_KEY_PREMIUM = os.getenv("ALPHA_VANTAGE_API_KEY_PREMIUM")
-FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY")
-TWELVE_DATA_API_KEY = os.getenv("TWELVE_DATA_API_KEY")
+def __getattr__(name):
+    if name not in ENV_SETTINGS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    load_env()
+    env_var, default, convert = ENV_SETTINGS[name]
+    value = os.getenv(env_var)
+    return default if value is None else convert(value)
 
 # API endpoints configuration
 API_CONFIG = {
     "alpha_vantage": {
         "base_url": "https://www.alphavantage.co/query",
         "key_param": "apikey",
-        "rate_limit": 150  # requests per minute
+        "rate_limit": 150,  # requests per minute
+        # Per-key budgets (requests per minute), tried in this order
+        "key_rate_limits": {
+            "ALPHA_VANTAGE_API_KEY_PREMIUM": 150,
+            "ALPHA_VANTAGE_API_KEY": 5
+        },
+        # Keys that can serve premium-only requests (e.g. outputsize=full)
+        "premium_keys": ["ALPHA_VANTAGE_API_KEY_PREMIUM"]
     },
     "finnhub": {
         "base_url": "https://finnhub.io/api/v1",
@@ -25,4 +55,24 @@ API_CONFIG = {
 }
 
 # App configuration
-CACHE_EXPIRATION = 3600  # 1 hour in seconds
\ No newline at end of file
+CACHE_EXPIRATION = 3600  # 1 hour in seconds
+CACHE_REFRESH_AHEAD = 300  # warmer refreshes entries this close to expiry
+
+# Negative caching of failed fetches, seconds per failure class (see circuit_breaker.py)
+NEGATIVE_CACHE_TTL = {
+    "invalid_symbol": 6 * 3600,
+    "throttle": 60,
+    "transient": 30,
+    "server_error": 120,
+    "unavailable": 3600
+}
+BREAKER_FAILURE_THRESHOLD = 3  # consecutive failures before a symbol/endpoint breaker opens
+BREAKER_COOLDOWN = 300  # seconds an open breaker fails fast before a trial call
+
+# Background cache warmer (see cache_warmer.py; WARMER_ENABLED is read from the environment)
+WARMER_MIN_SPARE = 0.5  # only warm while at least half of the combined (rate-weighted) minute budget is unused
+WARMER_INTERVAL = 300  # seconds between passes over the universe
+WARMER_THROTTLE_BACKOFF = 600  # seconds to pause after a throttle response
+
+# Materialized indicator snapshots (see materialize.py; SNAPSHOT_DB is read from the environment)
+MARKET_CLOSE_DELAY = 1800  # seconds after the 16:00 ET close before materializing
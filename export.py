@@ -0,0 +1,179 @@
+import io
+import os
+import uuid
+from datetime import date
+
+import config
+from ants import ANT_COLORS
+from tickers import TICKERS
+
+# Typed exports of verification results, indicator snapshots and Ants scans as
+# hive-partitioned datasets: <root>/<dataset>.<format>/run_date=.../sector=.../part-*.
+# pyarrow is imported on first use so the app starts without it.
+
+VERIFICATION, SNAPSHOTS, ANTS_SCAN = "verification", "snapshots", "ants_scan"
+FORMATS = {"parquet": "parquet", "arrow": "ipc"}  # export format -> pyarrow.dataset format
+PARTITION_COLUMNS = ("run_date", "sector")
+UNKNOWN_SECTOR = "Other"
+
+SECTOR_OF = {ticker: sector for sector, symbols in TICKERS.items() for ticker in symbols}
+
+def group_by_sector(tickers):
+    """{sector: [tickers]} for `tickers`; tickers not in tickers.TICKERS go to UNKNOWN_SECTOR"""
+    groups = {}
+    for ticker in tickers:
+        groups.setdefault(SECTOR_OF.get(ticker, UNKNOWN_SECTOR), []).append(ticker)
+    return groups
+
+def dataset_path(dataset, root=None, format="parquet"):
+    """Directory of an export dataset; each format gets its own so they never mix"""
+    if format not in FORMATS:
+        raise ValueError(f"Unsupported export format: {format}")
+    return os.path.join(root or config.EXPORT_DIR, f"{dataset}.{format}")
+
+def _partitioning():
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    schema = pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS])
+    return ds.partitioning(schema, flavor="hive")
+
+def dataset_schema(dataset):
+    """Arrow schema of an export dataset, partition columns included.
+
+    Pinned per dataset so every batch is written with the same types
+    whatever its data: text categoricals are always
+    dictionary<int32, string>, even when a batch has no text values.
+    """
+    import pyarrow as pa
+
+    text = pa.dictionary(pa.int32(), pa.string())
+    timestamp = pa.timestamp("ns")
+    fields = {
+        VERIFICATION: [
+            ("ticker", text), ("indicator", text),
+            ("verification", pa.float64()), ("ghostscore", pa.float64()),
+            ("verification_text", text), ("ghostscore_text", text),
+            ("pct_diff", pa.float64()), ("status", text)
+        ],
+        SNAPSHOTS: [
+            ("ticker", text), ("as_of", timestamp), ("indicator", text),
+            ("value", pa.float64()), ("value_text", text)
+        ],
+        ANTS_SCAN: [
+            ("ticker", text), ("param_index", pa.int16()), ("window", pa.int16()),
+            ("momentum_threshold", pa.int16()), ("price_threshold", pa.float32()),
+            ("volume_threshold", pa.float32()), ("position", pa.int32()),
+            ("ant_color", pa.dictionary(pa.int32(), pa.string(), ordered=True)),
+            ("exploration_score", pa.int8())
+        ] + [(f"{color}_ants", pa.int32()) for color in ANT_COLORS] + [("date", timestamp)]
+    }[dataset]
+    return pa.schema(fields + [(name, pa.string()) for name in PARTITION_COLUMNS])
+
+def _column(values, field):
+    import pandas as pd
+    import pyarrow as pa
+
+    if not pa.types.is_dictionary(field.type):
+        return pa.array(values, type=field.type, from_pandas=True)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Keep the category order (e.g. ant colors); code -1 is null
+        codes = values.cat.codes.to_numpy()
+        dictionary = pa.array([str(c) for c in values.cat.categories], type=pa.string())
+        indices = pa.array(codes, type=pa.int32(), mask=codes < 0)
+        return pa.DictionaryArray.from_arrays(indices, dictionary).cast(field.type)
+    strings = [None if pd.isna(v) else str(v) for v in values]
+    return pa.array(strings, type=pa.string()).dictionary_encode().cast(field.type)
+
+def _to_table(frame, dataset):
+    """Arrow table of a frame in the dataset's pinned schema"""
+    import pyarrow as pa
+
+    schema = dataset_schema(dataset)
+    missing = [name for name in schema.names if name not in frame.columns]
+    extra = [name for name in frame.columns if name not in schema.names]
+    if missing or extra:
+        raise ValueError(f"Frame does not match the {dataset} schema (missing {missing}, unexpected {extra})")
+    return pa.Table.from_arrays([_column(frame[field.name], field) for field in schema], schema=schema)
+
+def with_partitions(frame, run_date=None, sector=None):
+    """`frame` with run_date and sector columns (sector from `ticker` unless given)"""
+    if sector is None:
+        sector = frame["ticker"].astype(str).map(SECTOR_OF).fillna(UNKNOWN_SECTOR)
+    return frame.assign(run_date=str(run_date or date.today()), sector=sector)
+
+class DatasetWriter:
+    """Append typed frames to a partitioned dataset as a run proceeds.
+
+    Every write() adds one file per (run_date, sector) partition it touches,
+    so a run never has to hold all of its results in memory. Files are
+    named per writer, so concurrent or repeated runs never overwrite each
+    other.
+    """
+
+    def __init__(self, dataset, run_date=None, root=None, format="parquet"):
+        self.dataset = dataset
+        self.path = dataset_path(dataset, root, format)
+        self.run_date = str(run_date or date.today())
+        self.format = format
+        self.batches = 0
+        self.rows = 0
+        self._prefix = f"part-{uuid.uuid4().hex[:12]}"
+
+    def write(self, frame, sector=None):
+        """Write one batch (a frame with a `ticker` column unless `sector` is given)"""
+        import pyarrow.dataset as ds
+
+        if frame is None or frame.empty:
+            return
+        ds.write_dataset(
+            _to_table(with_partitions(frame, self.run_date, sector), self.dataset),
+            self.path,
+            format=FORMATS[self.format],
+            partitioning=_partitioning(),
+            basename_template=f"{self._prefix}-{self.batches:05d}-{{i}}.{self.format}",
+            existing_data_behavior="overwrite_or_ignore"
+        )
+        self.batches += 1
+        self.rows += len(frame)
+
+def read_export(dataset, columns=None, run_dates=None, sectors=None, tickers=None,
+                root=None, format="parquet"):
+    """Read an exported dataset back as a DataFrame.
+
+    Only the requested `columns` are read, `run_dates` / `sectors` prune
+    whole partition directories and `tickers` is pushed down as a row filter.
+    """
+    import pyarrow.dataset as ds
+
+    path = dataset_path(dataset, root, format)
+    if not os.path.isdir(path):
+        print(f"No {dataset} export at {path}")
+        return None
+
+    data = ds.dataset(path, schema=dataset_schema(dataset), format=FORMATS[format],
+                      partitioning=_partitioning())
+    conditions = [
+        ds.field(name).isin([str(v) for v in values])
+        for name, values in (("run_date", run_dates), ("sector", sectors), ("ticker", tickers))
+        if values
+    ]
+    condition = None
+    for c in conditions:
+        condition = c if condition is None else condition & c
+    return data.to_table(columns=columns, filter=condition).to_pandas()
+
+def frame_bytes(frame, dataset, format="parquet"):
+    """A frame in the dataset's schema as Parquet or Arrow IPC bytes, e.g. for a download button"""
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+
+    table = _to_table(frame, dataset)
+    buffer = io.BytesIO()
+    if format == "parquet":
+        pq.write_table(table, buffer)
+    elif format == "arrow":
+        feather.write_feather(table, buffer)
+    else:
+        raise ValueError(f"Unsupported export format: {format}")
+    return buffer.getvalue()
@@ -0,0 +1,48 @@
+import subprocess
+import sys
+
+# Cold-import budgets (ms) for the modules every entry point loads. pandas,
+# requests, plotly and python-dotenv are imported on first use, so these
+# stay well below the cost of importing pandas alone.
+IMPORT_BUDGETS_MS = {
+    "config": 15,
+    "scheduler": 20,
+    "circuit_breaker": 15,
+    "api_handler": 50,
+    "ants": 200,  # numpy
+    "verification_jobs": 75
+}
+
+def import_time_ms(module, runs=5):
+    """Best-of-`runs` cumulative cold import time of `module` in a fresh interpreter"""
+    best = None
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, check=True
+        )
+        # Last line is the top-level module: "import time: self | cumulative | name"
+        cumulative = int(result.stderr.strip().splitlines()[-1].split("|")[1])
+        best = cumulative if best is None else min(best, cumulative)
+    return best / 1000
+
+def check_budgets(budgets=IMPORT_BUDGETS_MS, runs=5):
+    """Print import times against their budgets; True if all are within budget"""
+    ok = True
+    for module, budget in budgets.items():
+        elapsed = import_time_ms(module, runs)
+        within = elapsed <= budget
+        ok = ok and within
+        print(f"{module:<20} {elapsed:8.1f} ms  (budget {budget} ms){'' if within else '  OVER BUDGET'}")
+    return ok
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Check cold import times against their budgets")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    sys.exit(0 if check_budgets(runs=args.runs) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,87 @@
 import streamlit as st
 import pandas as pd
 import json
-from api_handler import get_ohlcv_data, get_technical_indicators
-from config import CACHE_EXPIRATION
+import time
+from ants import calculate_ants_indicator
+from ants_chart import render_ants_chart
+from api_handler import get_daily_history
+from cache_warmer import CacheWarmer
+from config import CACHE_EXPIRATION, WARMER_ENABLED
+from export import VERIFICATION, frame_bytes, with_partitions
+from materialize import last_market_close, load_snapshot_index
+from scheduler import INTERACTIVE, request_context
+from schema import (DIFFERENT_STATUSES, MATCHING_STATUSES, MISSING_STATUSES, comparison_display,
+                    comparison_frame, status_counts)
+from verification_jobs import VerificationJobs
 
-# Cache data fetches
-@st.cache_data(ttl=CACHE_EXPIRATION)
-def fetch_verification_data(ticker, source):
-    ohlcv = get_ohlcv_data(ticker, source)
-    if ohlcv:
-        indicators = get_technical_indicators(ticker, source)
-        return {**ohlcv, **indicators}
+PROGRESS_POLL_INTERVAL = 0.5  # seconds between refreshes while verification runs
+
+# Latest materialized snapshot, shared across sessions and reloaded once per cache period
+@st.cache_resource(ttl=CACHE_EXPIRATION)
+def get_snapshot_index():
+    return load_snapshot_index()
+
+# One background warmer per server process, started with the app
+@st.cache_resource
+def get_cache_warmer():
+    return CacheWarmer().start()
+
+def show_cache_readiness(warmer):
+    status = warmer.status()
+    states = pd.Series([info["state"] for info in status.values()])
+    with st.sidebar.expander(f"Cache readiness ({(states == 'ready').sum()}/{len(states)} ready)"):
+        st.dataframe(
+            pd.DataFrame([
+                {"Ticker": ticker, "Sector": info["sector"], "State": info["state"]}
+                for ticker, info in status.items()
+            ]),
+            hide_index=True,
+            use_container_width=True
+        )
+
+def snapshot_data(ticker):
+    """Materialized verification data for `ticker` if it is current, else None"""
+    snapshot = get_snapshot_index().get(ticker)
+    if snapshot and snapshot["as_of"] >= str(last_market_close()):
+        return snapshot["data"]
     return None
 
+def carry_indicator_filter(ticker, options):
+    """Session state key of the indicator filter for `ticker`, with its selection carried forward.
+
+    Options grow while verification stages finish; the user's selection is
+    kept and indicators that arrived since the last run are added to it.
+    """
+    key = f"indicator_filter_{ticker}"
+    seen = st.session_state.setdefault("indicator_filter_options", {})
+    if key in st.session_state and ticker in seen:
+        selected = set(st.session_state[key])
+        st.session_state[key] = [o for o in options if o in selected or o not in seen[ticker]]
+    else:
+        st.session_state[key] = list(options)
+    seen[ticker] = set(options)
+    return key
+
+# Serialized once per filtered frame instead of on every progress rerun
+@st.cache_data(max_entries=16)
+def comparison_bytes(typed_df, format):
+    return frame_bytes(typed_df, VERIFICATION, format)
+
+@st.cache_data(ttl=CACHE_EXPIRATION)
+def fetch_ants_data(ticker):
+    with request_context(INTERACTIVE, owner=f"ui:{ticker}"):
+        history = get_daily_history(ticker)
+    if history is None:
+        return None
+    return calculate_ants_indicator(history)
+
 def main():
     st.set_page_config(layout="wide", page_title="Ghost-Verification")
     st.title("📊 Ghost-Verification System")
     st.caption("Compare technical indicator values between verification system and GhostScore Platform")
+
+    if WARMER_ENABLED:
+        show_cache_readiness(get_cache_warmer())
     
     # --- GhostScore Data Input (Required First Step) ---
     ghost_score_json = st.sidebar.text_area(
@@ -57,138 +122,132 @@ def main():
             index=0
         )
         
-        # --- Fetch Verification Data ---
-        with st.spinner(f"Fetching verification data for {selected_ticker}..."):
-            verification_data = fetch_verification_data(selected_ticker, api_source)
-            if not verification_data:
-                st.error("Failed to fetch verification data")
-                st.stop()
-            
-            # Convert to dataframes
-            df_base = pd.DataFrame(
-                [(k, v) for k, v in verification_data.items()],
-                columns=["Indicator", "Verification App"]
-            )
-            
-            df_comp = pd.DataFrame(
-                [(k, v) for k, v in ticker_data.items()],
-                columns=["Indicator", "GhostScore Platform"]
+        # --- Fetch Verification Data (in the background, shown as it arrives) ---
+        jobs = st.session_state.setdefault(
+            "verification_jobs",
+            VerificationJobs(snapshot_lookup=snapshot_data)
+        )
+        job = jobs.select(selected_ticker, api_source)
+        verification_data = job.data()
+        finished, total = job.progress()
+        
+        if job.failed:
+            st.error("Failed to fetch verification data")
+            st.stop()
+        if not job.done:
+            st.progress(
+                finished / total,
+                text=f"Fetching verification data for {selected_ticker}... "
+                     f"({finished}/{total} indicator groups)"
             )
-            
-            # --- Comparison Logic ---
-            comparison_df = pd.merge(
-                df_base, 
-                df_comp, 
-                on="Indicator", 
-                how="outer",
-                suffixes=(" (Verification)", " (GhostScore)")
+        
+        # --- Comparison Logic (typed; display strings only at the UI boundary) ---
+        comparison_df = comparison_frame(verification_data, ticker_data, pending=not job.done)
+        
+        # --- Display Results with DataFrame Filters ---
+        st.subheader("🔍 Filter and Compare Results")
+        
+        # Create expandable filter controls above the dataframes
+        with st.expander("🔎 Filter Options", expanded=True):
+            indicator_options = list(comparison_df["indicator"].astype(str).unique())
+            indicator_filter = st.multiselect(
+                "Filter by indicator:",
+                options=indicator_options,
+                key=carry_indicator_filter(selected_ticker, indicator_options),
+                help="Select which indicators to display"
             )
-            
-            def highlight_diff(row):
-                try:
-                    val1 = row["Verification App"]
-                    val2 = row["GhostScore Platform"]
-                    
-                    if pd.isna(val1):
-                        return "🔴 Missing in Verification"
-                    if pd.isna(val2):
-                        return "🔵 Missing in GhostScore"
-                    
-                    if isinstance(val1, (int, float)) and isinstance(val2, (int, float)):
-                        diff = val1 - val2
-                        pct_diff = (diff / val1) * 100 if val1 != 0 else 0
-                        
-                        if abs(pct_diff) > 1.0:  # 1% threshold
-                            direction = "🔺" if diff > 0 else "🔻"
-                            return f"{direction} {abs(pct_diff):.2f}%"
-                        return "✅ Within 1%"
-                    
-                    # For non-numeric comparison
-                    return "✅ Match" if val1 == val2 else "⚠️ Different"
-                
-                except Exception:
-                    return "⚪ N/A"
-            
-            comparison_df["Difference"] = comparison_df.apply(highlight_diff, axis=1)
-            
-            # --- Display Results with DataFrame Filters ---
-            st.subheader("🔍 Filter and Compare Results")
-            
-            # Create expandable filter controls above the dataframes
-            with st.expander("🔎 Filter Options", expanded=True):
-                indicator_filter = st.multiselect(
-                    "Filter by indicator:",
-                    options=comparison_df["Indicator"].unique(),
-                    default=comparison_df["Indicator"].unique(),
-                    help="Select which indicators to display"
-                )
-            
-            # Apply filters
-            filtered_df = comparison_df.copy()
-            
-            if indicator_filter:
-                filtered_df = filtered_df[filtered_df["Indicator"].isin(indicator_filter)]
-            
-            # Display filtered data in columns
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.subheader("Verification Data")
-                st.dataframe(
-                    filtered_df[["Indicator", "Verification App"]],
-                    height=700,
-                    use_container_width=True,
-                    hide_index=True
-                )
-            
-            with col2:
-                st.subheader("GhostScore Data")
-                st.dataframe(
-                    filtered_df[["Indicator", "GhostScore Platform"]],
-                    height=700,
-                    use_container_width=True,
-                    hide_index=True
-                )
-            
-            # --- Differences Analysis ---
-            st.subheader("🔎 Differences Analysis")
-            
-            # Metrics (based on filtered data)
-            diff_stats = filtered_df["Difference"].value_counts().to_dict()
-            
-            cols = st.columns(4)
-            cols[0].metric("Total Indicators", len(filtered_df))
-            cols[1].metric("Matching Indicators", 
-                          diff_stats.get("✅ Within 1%", 0) + 
-                          diff_stats.get("✅ Match", 0))
-            cols[2].metric("Significant Differences", 
-                          diff_stats.get("🔺", 0) + 
-                          diff_stats.get("🔻", 0))
-            cols[3].metric("Missing Indicators", 
-                         diff_stats.get("🔴 Missing in Verification", 0) + 
-                         diff_stats.get("🔵 Missing in GhostScore", 0))
-            
-            # Detailed differences (filtered)
+        
+        # Apply filters
+        filtered = comparison_df
+        
+        if indicator_filter:
+            filtered = filtered[filtered["indicator"].isin(indicator_filter)]
+        filtered_df = comparison_display(filtered)
+        
+        # Display filtered data in columns
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Verification Data")
             st.dataframe(
-                filtered_df,
-                height=500,
+                filtered_df[["Indicator", "Verification App"]],
+                height=700,
                 use_container_width=True,
-                hide_index=True,
-                column_config={
-                    "Difference": st.column_config.Column(
-                        width="medium",
-                        help="Verification vs GhostScore comparison"
-                    )
-                }
+                hide_index=True
             )
-            
-            # --- Download Options ---
-            st.download_button(
-                label="📥 Download Filtered Comparison (CSV)",
-                data=filtered_df.to_csv(index=False).encode('utf-8'),
-                file_name=f"{selected_ticker}_filtered_comparison.csv",
-                mime='text/csv'
+        
+        with col2:
+            st.subheader("GhostScore Data")
+            st.dataframe(
+                filtered_df[["Indicator", "GhostScore Platform"]],
+                height=700,
+                use_container_width=True,
+                hide_index=True
             )
+        
+        # --- Differences Analysis ---
+        st.subheader("🔎 Differences Analysis")
+        
+        # Metrics (based on filtered data)
+        diff_stats = status_counts(filtered)
+        
+        cols = st.columns(4)
+        cols[0].metric("Total Indicators", len(filtered))
+        cols[1].metric("Matching Indicators", 
+                      sum(diff_stats[s] for s in MATCHING_STATUSES))
+        cols[2].metric("Significant Differences", 
+                      sum(diff_stats[s] for s in DIFFERENT_STATUSES))
+        cols[3].metric("Missing Indicators", 
+                     sum(diff_stats[s] for s in MISSING_STATUSES))
+        
+        # Detailed differences (filtered)
+        st.dataframe(
+            filtered_df,
+            height=500,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Difference": st.column_config.Column(
+                    width="medium",
+                    help="Verification vs GhostScore comparison"
+                )
+            }
+        )
+        
+        # --- Download Options ---
+        st.download_button(
+            label="📥 Download Filtered Comparison (CSV)",
+            data=filtered_df.to_csv(index=False).encode('utf-8'),
+            file_name=f"{selected_ticker}_filtered_comparison.csv",
+            mime='text/csv'
+        )
+        
+        # Typed columns (categorical statuses, float values) for loading back without parsing
+        typed_df = with_partitions(filtered.assign(ticker=selected_ticker))
+        parquet_col, arrow_col = st.columns(2)
+        parquet_col.download_button(
+            label="📥 Download Filtered Comparison (Parquet)",
+            data=comparison_bytes(typed_df, "parquet"),
+            file_name=f"{selected_ticker}_filtered_comparison.parquet",
+            mime='application/vnd.apache.parquet'
+        )
+        arrow_col.download_button(
+            label="📥 Download Filtered Comparison (Arrow)",
+            data=comparison_bytes(typed_df, "arrow"),
+            file_name=f"{selected_ticker}_filtered_comparison.arrow",
+            mime='application/vnd.apache.arrow.file'
+        )
+        
+        # --- Ants Indicator Chart ---
+        st.subheader("🐜 Ants Indicator")
+        if st.checkbox("Show Ants chart", value=False, help="Fetches the full daily history"):
+            render_ants_chart(fetch_ants_data(selected_ticker), key=f"ants_{selected_ticker}")
+
+        # Poll until every indicator group has arrived; changing the
+        # selection reruns the script and cancels the stale job
+        if not job.done:
+            time.sleep(PROGRESS_POLL_INTERVAL)
+            st.rerun()
     
     except json.JSONDecodeError:
         st.error("Invalid JSON format. Please check your input and try again.")
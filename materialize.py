@@ -0,0 +1,172 @@
+import json
+import sqlite3
+import time
+from datetime import datetime, timedelta, time as dt_time
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from ants import calculate_ants_indicator, calculate_ants_score
+from api_handler import get_daily_history, get_ohlcv_data, get_technical_indicators
+import config
+from config import MARKET_CLOSE_DELAY
+from export import SNAPSHOTS, DatasetWriter
+from scheduler import BATCH, request_context
+from schema import indicator_frame
+from tickers import TICKERS
+
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_CLOSE = dt_time(16, 0)
+
+def last_market_close(now=None):
+    """Date of the most recent completed US trading session (weekends skipped, holidays not)"""
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    day = now.date()
+    if now.time() < MARKET_CLOSE:
+        day -= timedelta(days=1)
+    while day.weekday() >= 5:
+        day -= timedelta(days=1)
+    return day
+
+def connect(path=None):
+    """Open the snapshot store (config.SNAPSHOT_DB by default), creating the table on first use"""
+    conn = sqlite3.connect(path or config.SNAPSHOT_DB, check_same_thread=False)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS snapshots (
+            ticker TEXT NOT NULL,
+            as_of TEXT NOT NULL,
+            sector TEXT,
+            payload TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (ticker, as_of)
+        )
+    """)
+    return conn
+
+def save_snapshot(conn, ticker, as_of, record, sector=None, replace=True):
+    """Insert the materialized record for (ticker, as_of); an existing row is kept unless `replace`"""
+    conn.execute(
+        f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO snapshots "
+        "(ticker, as_of, sector, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+        (ticker, str(as_of), sector, json.dumps(record), time.time())
+    )
+    conn.commit()
+
+def load_snapshot_index(path=None):
+    """Latest record per ticker as {ticker: {"as_of": ..., **record}} for O(1) lookups"""
+    path = path or config.SNAPSHOT_DB
+    index = {}
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    except sqlite3.Error:
+        return index  # No snapshot has been materialized yet
+
+    try:
+        rows = conn.execute("""
+            SELECT s.ticker, s.as_of, s.payload FROM snapshots s
+            JOIN (SELECT ticker, MAX(as_of) AS as_of FROM snapshots GROUP BY ticker) latest
+            ON s.ticker = latest.ticker AND s.as_of = latest.as_of
+        """).fetchall()
+    except sqlite3.Error as e:
+        print(f"Error reading snapshot store {path}: {str(e)}")
+        rows = []
+    finally:
+        conn.close()
+
+    for ticker, as_of, payload in rows:
+        index[ticker] = {"as_of": as_of, **json.loads(payload)}
+    return index
+
+def materialize_ticker(ticker, source="alpha_vantage"):
+    """Compute the verification data, OHLCV and latest Ants values for one ticker"""
+    ohlcv = get_ohlcv_data(ticker, source)
+    if not ohlcv:
+        return None
+
+    record = {"data": {**ohlcv, **get_technical_indicators(ticker, source)}, "ants": {}}
+
+    history = get_daily_history(ticker)
+    if history is not None and len(history):
+        color = calculate_ants_indicator(history)["ant_color"].iloc[-1]
+        scores = calculate_ants_score(history.rename(columns={"close": "Close", "volume": "Volume"}))
+        record["ants"] = {
+            "date": str(history.index[-1].date()),
+            "ant_color": None if pd.isna(color) else color,
+            **{k: int(v) for k, v in scores.iloc[-1].items()}
+        }
+    return record
+
+def snapshot_frame(ticker, as_of, record):
+    """Typed indicator rows of a materialized record (see schema.indicator_frame)"""
+    frame = indicator_frame(record["data"])
+    frame.insert(0, "ticker", ticker)
+    frame.insert(1, "as_of", pd.Timestamp(as_of))
+    return frame
+
+def materialize_universe(as_of=None, tickers=None, path=None, export=False):
+    """Materialize every ticker in tickers.TICKERS (or a {sector: [...]} subset) for one as-of date.
+
+    With `export`, each sector's indicator snapshots are also appended to
+    the partitioned export.SNAPSHOTS dataset once the sector is done.
+    """
+    as_of = as_of or last_market_close()
+    tickers = tickers or TICKERS
+    conn = connect(path)
+    writer = DatasetWriter(SNAPSHOTS, run_date=as_of) if export else None
+    done, failed = 0, []
+
+    try:
+        for sector, symbols in tickers.items():
+            batch = []
+            for ticker in symbols:
+                with request_context(BATCH, owner="materialize"):
+                    record = materialize_ticker(ticker)
+                if record is None:
+                    failed.append(ticker)
+                    continue
+                save_snapshot(conn, ticker, as_of, record, sector)
+                if writer:
+                    batch.append(snapshot_frame(ticker, as_of, record))
+                done += 1
+                print(f"[{as_of}] {sector}/{ticker} materialized")
+            if writer and batch:
+                frame = pd.concat(batch, ignore_index=True)
+                frame["ticker"] = frame["ticker"].astype("category")
+                frame["indicator"] = frame["indicator"].astype(str).astype("category")
+                writer.write(frame, sector=sector)
+    finally:
+        conn.close()
+
+    print(f"Materialized {done} tickers for {as_of}; failed: {', '.join(failed) or 'none'}")
+    return done, failed
+
+def seconds_until_next_run(now=None):
+    """Seconds until MARKET_CLOSE_DELAY after the next weekday close"""
+    now = (now or datetime.now(MARKET_TZ)).astimezone(MARKET_TZ)
+    run_at = datetime.combine(now.date(), MARKET_CLOSE, MARKET_TZ) + timedelta(seconds=MARKET_CLOSE_DELAY)
+    while run_at <= now or run_at.weekday() >= 5:
+        run_at += timedelta(days=1)
+    return (run_at - now).total_seconds()
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Materialize indicator snapshots for the ticker universe")
+    parser.add_argument("--as-of", help="Snapshot date (default: last market close)")
+    parser.add_argument("--daemon", action="store_true", help="Run again after every market close")
+    parser.add_argument("--export", action="store_true",
+                        help="Also write the snapshots to the partitioned Parquet export (see export.py)")
+    args = parser.parse_args()
+
+    if not args.daemon:
+        materialize_universe(as_of=args.as_of, export=args.export)
+        return
+
+    while True:
+        wait = seconds_until_next_run()
+        print(f"Next materialization in {wait / 3600:.1f}h")
+        time.sleep(wait)
+        materialize_universe(export=args.export)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ants import ANT_COLORS, DEFAULT_ANTS_PARAMS, ant_color_codes, ants_score_arrays
+
+# Rows of the shared price block
+PRICE_FIELDS = ("close", "volume")
+
+# Indicators that can be recomputed from daily closes alone
+LOCAL_MA_PERIODS = [15, 45, 50]
+CLOSE_LOOKBACK = 24
+
+# Column arrays returned by _scan_chunk
+SCAN_COLUMNS = ["ticker_index", "param_index", "position", "ant_code", "exploration_score"] + [
+    f"{color}_ants" for color in ANT_COLORS
+]
+
+# Per-worker view of the shared price block (set by the pool initializer)
+_worker_state = {}
+
+def pack_price_arrays(frames):
+    """Copy close/volume series of every ticker into one shared-memory block.
+
+    Returns the SharedMemory handle and a layout list of
+    (ticker, offset, length) entries in the same order as `frames`.
+    The caller owns the handle and must close() and unlink() it.
+    """
+    tickers = list(frames)
+    lengths = [len(frames[t]) for t in tickers]
+    total = sum(lengths)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(PRICE_FIELDS) * total * 8))
+    block = np.ndarray((len(PRICE_FIELDS), total), dtype=np.float64, buffer=shm.buf)
+
+    layout = []
+    offset = 0
+    for ticker, length in zip(tickers, lengths):
+        for row, field in enumerate(PRICE_FIELDS):
+            block[row, offset:offset + length] = frames[ticker][field].to_numpy(dtype=np.float64)
+        layout.append((ticker, offset, length))
+        offset += length
+
+    del block
+    return shm, layout
+
+def _attach_prices(shm_name, total):
+    """Pool initializer: map the shared price block into this worker"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_state["shm"] = shm
+    _worker_state["block"] = np.ndarray((len(PRICE_FIELDS), total), dtype=np.float64, buffer=shm.buf)
+
+def _ticker_arrays(offset, length):
+    block = _worker_state["block"]
+    return block[0, offset:offset + length], block[1, offset:offset + length]
+
+def _scan_chunk(chunk, param_sets):
+    """Worker task: Ants scan of a chunk of tickers for every parameter set.
+
+    Returns {column: array} with one entry per (ticker, parameter set,
+    snapshot); ant counts cover bars up to the snapshot only. Tickers and parameter sets are referenced by index so the
+    parent can assemble the frame without per-row Python objects.
+    """
+    columns = {name: [] for name in SCAN_COLUMNS}
+    for index, ticker, offset, length, positions in chunk:
+        close, volume = _ticker_arrays(offset, length)
+        positions = np.asarray(positions, dtype=np.int32)
+        n = len(positions)
+        for param_index, params in enumerate(param_sets):
+            codes = ant_color_codes(close, volume, **params)
+            _, _, _, score = ants_score_arrays(
+                close, volume,
+                period=params["window"],
+                momentum_threshold=params["momentum_threshold"],
+                price_threshold=params["price_threshold"],
+                volume_threshold=params["volume_threshold"]
+            )
+            # Ants seen up to and including each snapshot bar, never after it
+            seen = np.cumsum(codes[:, None] == np.arange(1, len(ANT_COLORS) + 1), axis=0, dtype=np.int32)
+            counts = seen[positions]
+            columns["ticker_index"].append(np.full(n, index, dtype=np.int32))
+            columns["param_index"].append(np.full(n, param_index, dtype=np.int16))
+            columns["position"].append(positions)
+            columns["ant_code"].append(codes[positions])
+            columns["exploration_score"].append(score[positions])
+            for i, color in enumerate(ANT_COLORS):
+                columns[f"{color}_ants"].append(counts[:, i])
+    return {name: np.concatenate(parts) for name, parts in columns.items()}
+
+def _local_indicators(close, pos):
+    """Close lookbacks and SMAs at bar `pos`, named like get_technical_indicators"""
+    indicators = {}
+    for i in range(1, CLOSE_LOOKBACK + 1):
+        indicators[f"Close-{i}"] = float(close[pos - i]) if pos - i >= 0 else None
+    for period in LOCAL_MA_PERIODS:
+        if pos + 1 >= period:
+            indicators[f"ma{period}"] = float(close[pos + 1 - period:pos + 1].mean())
+    return indicators
+
+def _verify_chunk(chunk):
+    """Worker task: local indicators of a chunk of tickers"""
+    rows = []
+    for index, ticker, offset, length, positions in chunk:
+        close, _ = _ticker_arrays(offset, length)
+        for pos in positions:
+            rows.append((index, 0, pos, {"ticker": ticker, "position": pos,
+                                         **_local_indicators(close, pos)}))
+    return rows
+
+def _snapshot_positions(frame, snapshots):
+    """Bar positions of the last bar on or before each snapshot date"""
+    if not snapshots:
+        return [len(frame) - 1]
+    positions = frame.index.searchsorted(snapshots, side="right") - 1
+    return [int(p) for p in positions if p >= 0]
+
+def _chunked(items, workers):
+    """Split work into ~4 chunks per worker so stragglers even out"""
+    size = max(1, math.ceil(len(items) / (workers * 4)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def _valid_frames(frames):
+    return {t: f for t, f in frames.items() if f is not None and len(f)}
+
+def _run_pool(frames, task, task_args=(), snapshots=None, workers=None):
+    """Run `task` over ticker chunks with prices shared through shared memory.
+
+    `frames` must already be filtered by _valid_frames; tasks refer to
+    tickers by their index in it. Returns the chunk results in chunk order.
+    """
+    if not frames:
+        return []
+    workers = workers or os.cpu_count() or 1
+
+    shm, layout = pack_price_arrays(frames)
+    total = sum(length for _, _, length in layout)
+    try:
+        items = [
+            (index, ticker, offset, length, _snapshot_positions(frames[ticker], snapshots))
+            for index, (ticker, offset, length) in enumerate(layout)
+        ]
+        chunks = _chunked(items, workers)
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_attach_prices,
+                                 initargs=(shm.name, total)) as pool:
+            futures = [pool.submit(task, chunk, *task_args) for chunk in chunks]
+            return [future.result() for future in futures]
+    finally:
+        shm.close()
+        shm.unlink()
+
+def scan_universe(frames, param_sets=None, snapshots=None, workers=None):
+    """Ants scan of many tickers across parameter sets and snapshot dates.
+
+    `frames` maps ticker -> DataFrame with `close` and `volume` columns
+    (see api_handler.get_daily_history). Returns a typed frame (see
+    schema.scan_frame) with one row per (ticker, parameter set, snapshot)
+    in ticker, parameter set, snapshot order.
+    """
+    import pandas as pd
+    from schema import scan_frame
+
+    frames = _valid_frames(frames)
+    param_sets = [{**DEFAULT_ANTS_PARAMS, **p} for p in (param_sets or [{}])]
+    parts = _run_pool(frames, _scan_chunk, (param_sets,), snapshots, workers)
+    if not parts:
+        return scan_frame({})
+
+    columns = {name: np.concatenate([part[name] for part in parts]) for name in SCAN_COLUMNS}
+    order = np.lexsort((columns["position"], columns["param_index"], columns["ticker_index"]))
+    columns = {name: values[order] for name, values in columns.items()}
+    ticker_index, param_index, position = columns["ticker_index"], columns["param_index"], columns["position"]
+
+    tickers = list(frames)
+    starts = np.cumsum([0] + [len(frames[t]) for t in tickers])[:-1]
+    dates = np.concatenate([frames[t].index.to_numpy() for t in tickers])
+    return scan_frame({
+        "ticker": pd.Categorical.from_codes(ticker_index, tickers).reorder_categories(sorted(tickers)),
+        "param_index": param_index,
+        **{name: np.array([p[name] for p in param_sets])[param_index] for name in DEFAULT_ANTS_PARAMS},
+        "position": position,
+        # Code 0 (no ant) maps to category code -1, i.e. NaN
+        "ant_color": pd.Categorical.from_codes(columns["ant_code"] - 1, categories=ANT_COLORS, ordered=True),
+        "exploration_score": columns["exploration_score"],
+        **{f"{color}_ants": columns[f"{color}_ants"] for color in ANT_COLORS},
+        "date": dates[starts[ticker_index] + position]
+    })
+
+def verify_universe(ghost_score_data, frames, workers=None, threshold=1.0):
+    """Compare locally computed closes/SMAs against GhostScore values for every ticker.
+
+    Returns a typed comparison frame (see schema.comparison_frame) with a
+    categorical `ticker` column, limited to indicators GhostScore reports.
+    """
+    import pandas as pd
+    from schema import comparison_frame
+
+    rows = [row for part in _run_pool(_valid_frames(frames), _verify_chunk, workers=workers) for row in part]
+    rows = [row for *_, row in sorted(rows, key=lambda r: r[:3])]
+    parts = []
+    for row in rows:
+        ghost = ghost_score_data.get(row["ticker"], {})
+        local = {name: value for name, value in row.items()
+                 if name not in ("ticker", "position") and name in ghost}
+        ghost = {name: ghost[name] for name in local}
+        if local:
+            part = comparison_frame(local, ghost, threshold=threshold)
+            part.insert(0, "ticker", row["ticker"])
+            parts.append(part)
+    if not parts:
+        return pd.DataFrame()
+    report = pd.concat(parts, ignore_index=True)
+    report["ticker"] = report["ticker"].astype("category")
+    report["indicator"] = report["indicator"].astype(str).astype("category")
+    return report
+
+def measure_peak_memory(func, *args, **kwargs):
+    """Run func and return (result, peak bytes traced in this process, peak RSS of pool workers)"""
+    import resource
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        result = func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # ru_maxrss is in KiB on Linux
+    worker_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+    return result, peak, worker_rss
+
+def benchmark_scaling(frames, param_sets=None, worker_counts=(1, 2, 4, 8)):
+    """Time scan_universe for several worker counts; returns {workers: seconds}"""
+    timings = {}
+    for workers in worker_counts:
+        start = time.perf_counter()
+        scan_universe(frames, param_sets, workers=workers)
+        timings[workers] = time.perf_counter() - start
+    return timings
+
+def export_universe(sectors, ghost_score_data=None, param_sets=None, workers=None,
+                    run_date=None, root=None):
+    """Scan (and optionally verify) a {sector: [tickers]} universe one sector at a time.
+
+    Each sector's prices are fetched, scanned and appended to the
+    partitioned export.ANTS_SCAN (and export.VERIFICATION) datasets before
+    the next sector starts, so only one sector is held in memory.
+    Returns the writers for reporting.
+    """
+    from api_handler import get_daily_history
+    from export import ANTS_SCAN, VERIFICATION, DatasetWriter
+    from scheduler import BATCH, request_context
+
+    scans = DatasetWriter(ANTS_SCAN, run_date=run_date, root=root)
+    verifications = DatasetWriter(VERIFICATION, run_date=run_date, root=root)
+    for sector, tickers in sectors.items():
+        with request_context(BATCH, owner="parallel_scan"):
+            frames = {ticker: get_daily_history(ticker) for ticker in tickers}
+        scans.write(scan_universe(frames, param_sets, workers=workers), sector=sector)
+        if ghost_score_data:
+            verifications.write(verify_universe(ghost_score_data, frames, workers), sector=sector)
+        print(f"Exported {sector}: {scans.rows} scan rows, {verifications.rows} verification rows so far")
+    return scans, verifications
+
+def main():
+    import argparse
+    import json
+    from api_handler import get_daily_history
+    from export import group_by_sector
+    from scheduler import BATCH, request_context
+    from tickers import ALL_TICKERS
+
+    parser = argparse.ArgumentParser(description="Universe-wide Ants scan on a process pool")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--tickers", nargs="*", default=ALL_TICKERS)
+    parser.add_argument("--measure-memory", action="store_true", help="Report peak memory of the scan")
+    parser.add_argument("--benchmark", type=int, nargs="*", metavar="WORKERS",
+                        help="Time the scan for these worker counts (default 1 2 4 8) instead of printing it")
+    parser.add_argument("--export", action="store_true",
+                        help="Write results sector by sector to the partitioned Parquet export (see export.py)")
+    parser.add_argument("--ghost-json", help="GhostScore JSON file to verify against when exporting")
+    args = parser.parse_args()
+
+    if args.export:
+        ghost_score_data = None
+        if args.ghost_json:
+            with open(args.ghost_json) as f:
+                ghost_score_data = json.load(f)
+        export_universe(group_by_sector(args.tickers), ghost_score_data, workers=args.workers)
+        return
+
+    with request_context(BATCH, owner="parallel_scan"):
+        frames = {ticker: get_daily_history(ticker) for ticker in args.tickers}
+
+    if args.benchmark is not None:
+        timings = benchmark_scaling(frames, worker_counts=args.benchmark or (1, 2, 4, 8))
+        baseline = next(iter(timings.values()))
+        for workers, seconds in timings.items():
+            print(f"{workers:3} workers: {seconds:.2f}s ({baseline / seconds:.1f}x)")
+        return
+
+    start = time.perf_counter()
+    if args.measure_memory:
+        results, peak, worker_rss = measure_peak_memory(scan_universe, frames, workers=args.workers)
+    else:
+        results = scan_universe(frames, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    for row in results.itertuples():
+        color = row.ant_color if isinstance(row.ant_color, str) else "-"
+        print(f"{row.ticker:6} {color:7} score={row.exploration_score}")
+    print(f"Scanned {len(frames)} tickers in {elapsed:.2f}s on {args.workers} workers")
+    if args.measure_memory:
+        print(f"Peak traced memory {peak / 2**20:.1f} MiB; peak worker RSS {worker_rss / 2**20:.1f} MiB; "
+              f"result frame {results.memory_usage(deep=True).sum() / 2**10:.1f} KiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Priority classes, lower value is served first
+INTERACTIVE, BATCH, PREFETCH = 0, 1, 2
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch", PREFETCH: "prefetch"}
+
+# Share of each key's per-minute budget a class may NOT touch, so that
+# background work always leaves headroom for interactive requests
+DEFAULT_RESERVE = {INTERACTIVE: 0.0, BATCH: 0.1, PREFETCH: 0.3}
+
+class RequestCancelled(Exception):
+    """The request was cancelled while waiting for a rate-limit slot"""
+
+class DeadlineExceeded(Exception):
+    """The request could not be scheduled before its deadline"""
+
+# Seconds a request waits for a preferred key before spilling onto a later one
+DEFAULT_FALLBACK_WAIT = 2.0
+
+class KeyBudget:
+    """Per-minute request budget of one API key"""
+
+    def __init__(self, name, key, rate_limit, premium=False):
+        self.name = name
+        self.key = key
+        self.rate_limit = rate_limit
+        self.premium = premium
+        self.min_interval = 60.0 / rate_limit
+        self.calls = deque()  # monotonic times of calls in the last minute
+
+    def _trim(self, now):
+        while self.calls and now - self.calls[0] >= 60.0:
+            self.calls.popleft()
+
+    def wait_time(self, now, reserve=0.0):
+        """Seconds until a call is allowed (None if the reserve blocks it for the whole window)"""
+        self._trim(now)
+        allowed = int(self.rate_limit * (1.0 - reserve))
+        if allowed <= 0:
+            return None
+        wait = 0.0
+        if self.calls:
+            wait = max(wait, self.calls[-1] + self.min_interval - now)
+        if len(self.calls) >= allowed:
+            wait = max(wait, self.calls[len(self.calls) - allowed] + 60.0 - now)
+        return wait
+
+    def spare(self, now):
+        """Fraction of the per-minute budget still unused"""
+        self._trim(now)
+        return 1.0 - len(self.calls) / self.rate_limit
+
+    def consume(self, now):
+        self.calls.append(now)
+
+class Ticket:
+    """A queued request; cancel() releases its waiter with RequestCancelled"""
+
+    def __init__(self, priority, owner, deadline, cancel_event):
+        self.priority = priority
+        self.owner = owner
+        self.deadline = deadline
+        self.cancel_event = cancel_event or threading.Event()
+        self.done = False
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+class RequestScheduler:
+    """Grants API calls by priority class, fair-queued per owner within a class.
+
+    Callers block in acquire() until one of the configured keys has budget
+    for their class; the key to use is returned. Keys are preferred in
+    config order: a request waits up to `fallback_wait` seconds for an
+    earlier key rather than spilling onto a later (e.g. free-tier) one.
+    Within a class, owners are served round-robin (start-time fair queuing
+    on request count), so one large batch cannot starve another caller of
+    the same class.
+    """
+
+    def __init__(self, budgets, reserve=None, poll_interval=0.25, fallback_wait=DEFAULT_FALLBACK_WAIT):
+        self.budgets = budgets
+        self.reserve = {**DEFAULT_RESERVE, **(reserve or {})}
+        self.poll_interval = poll_interval
+        self.fallback_wait = fallback_wait
+        self._cond = threading.Condition()
+        self._queue = []
+        self._seq = itertools.count()
+        self._class_round = {p: 0 for p in PRIORITY_NAMES}
+        self._owner_round = {}
+
+    def _enqueue(self, ticket):
+        key = (ticket.priority, ticket.owner)
+        start = max(self._class_round[ticket.priority], self._owner_round.get(key, -1) + 1)
+        self._owner_round[key] = start
+        heapq.heappush(self._queue, (ticket.priority, start, next(self._seq), ticket))
+
+    def _head(self):
+        while self._queue and self._queue[0][3].done:
+            heapq.heappop(self._queue)
+        return self._queue[0] if self._queue else None
+
+    def _candidates(self, premium):
+        """Keys that can serve the request (all keys if none is premium)"""
+        if premium:
+            return [b for b in self.budgets if b.premium] or self.budgets
+        return self.budgets
+
+    def _pick_budget(self, priority, now, premium=False):
+        """Key to use now (None to keep waiting) and the time to wait otherwise.
+
+        Keys are tried in config order; a key that frees up within
+        fallback_wait is waited for instead of falling back to later keys.
+        """
+        shortest = None
+        for budget in self._candidates(premium):
+            wait = budget.wait_time(now, self.reserve[priority])
+            if wait is None:
+                continue
+            if wait <= 0:
+                return budget, 0.0
+            shortest = wait if shortest is None else min(shortest, wait)
+            if wait <= self.fallback_wait:
+                break
+        return None, shortest
+
+    def _finish(self, ticket):
+        ticket.done = True
+        self._cond.notify_all()
+
+    def acquire(self, priority=BATCH, owner=None, deadline=None, cancel_event=None, premium=False):
+        """Block until a call may be made; returns the API key to use.
+
+        With `premium`, only premium keys are used (if any are configured).
+        """
+        if not self.budgets:
+            raise RuntimeError("No API keys configured for the request scheduler")
+        owner = owner or threading.current_thread().name
+        ticket = Ticket(priority, owner, deadline, cancel_event)
+
+        with self._cond:
+            self._enqueue(ticket)
+            self._cond.notify_all()
+            while True:
+                now = time.monotonic()
+                if ticket.cancelled:
+                    self._finish(ticket)
+                    raise RequestCancelled(f"{PRIORITY_NAMES[priority]} request from {owner} cancelled")
+                if deadline is not None and now >= deadline:
+                    self._finish(ticket)
+                    raise DeadlineExceeded(f"{PRIORITY_NAMES[priority]} request from {owner} missed its deadline")
+
+                timeout = self.poll_interval
+                head = self._head()
+                if head is not None and head[3] is ticket:
+                    budget, wait = self._pick_budget(priority, now, premium)
+                    if budget is not None:
+                        budget.consume(now)
+                        self._class_round[priority] = max(self._class_round[priority], head[1])
+                        self._finish(ticket)
+                        return budget.key
+                    if wait is not None:
+                        timeout = min(timeout, wait)
+                if deadline is not None:
+                    timeout = min(timeout, deadline - now)
+                self._cond.wait(max(timeout, 0.0))
+
+    def spare_capacity(self):
+        """Unused fraction of the combined per-minute budget, weighted by each key's rate.
+
+        An idle low-rate key barely counts, so background work only sees
+        spare capacity when the keys that carry the traffic have some.
+        """
+        with self._cond:
+            now = time.monotonic()
+            total = sum(b.rate_limit for b in self.budgets)
+            if not total:
+                return 0.0
+            return sum(b.spare(now) * b.rate_limit for b in self.budgets) / total
+
+    def queue_depth(self):
+        """Number of waiting requests per priority class"""
+        with self._cond:
+            depth = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _, _, ticket in self._queue:
+                if not ticket.done:
+                    depth[PRIORITY_NAMES[priority]] += 1
+            return depth
+
+# Per-thread request context read by api_handler.get_alpha_vantage_data
+_context = threading.local()
+
+@contextmanager
+def request_context(priority=BATCH, owner=None, timeout=None, cancel_event=None):
+    """Run API calls in this block with the given priority, owner, deadline and cancel event"""
+    previous = getattr(_context, "value", None)
+    _context.value = {
+        "priority": priority,
+        "owner": owner,
+        "deadline": time.monotonic() + timeout if timeout is not None else None,
+        "cancel_event": cancel_event
+    }
+    try:
+        yield _context.value
+    finally:
+        _context.value = previous
+
+def current_context():
+    """Request context of the calling thread (batch priority by default)"""
+    return getattr(_context, "value", None) or {
+        "priority": BATCH, "owner": None, "deadline": None, "cancel_event": None
+    }
@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from ants import ANT_COLORS
+
+# Typed schema for indicator, Ants and comparison frames. Strings such as
+# emoji statuses are produced only by the display helpers at the UI boundary.
+
+ANT_COLOR_DTYPE = pd.CategoricalDtype(ANT_COLORS, ordered=True)
+
+# Comparison statuses and their display labels
+WITHIN, MATCH, ABOVE, BELOW, DIFFERENT = "within", "match", "above", "below", "different"
+MISSING_VERIFICATION, MISSING_GHOSTSCORE, PENDING, NOT_AVAILABLE = (
+    "missing_verification", "missing_ghostscore", "pending", "na"
+)
+STATUS_LABELS = {
+    WITHIN: "✅ Within 1%",
+    MATCH: "✅ Match",
+    ABOVE: "🔺",
+    BELOW: "🔻",
+    DIFFERENT: "⚠️ Different",
+    MISSING_VERIFICATION: "🔴 Missing in Verification",
+    MISSING_GHOSTSCORE: "🔵 Missing in GhostScore",
+    PENDING: "⏳ Pending",
+    NOT_AVAILABLE: "⚪ N/A"
+}
+STATUS_DTYPE = pd.CategoricalDtype(list(STATUS_LABELS))
+
+MATCHING_STATUSES = [WITHIN, MATCH]
+DIFFERENT_STATUSES = [ABOVE, BELOW]
+MISSING_STATUSES = [MISSING_VERIFICATION, MISSING_GHOSTSCORE]
+
+DIFF_THRESHOLD = 1.0  # percent
+
+def _is_number(value):
+    return isinstance(value, (int, float, np.number)) and not pd.isna(value)
+
+def _is_missing(value):
+    return value is None or (isinstance(value, (float, np.floating)) and np.isnan(value))
+
+def _numeric(values):
+    return np.array([float(v) if _is_number(v) else np.nan for v in values], dtype=np.float64)
+
+def _text(values):
+    """Non-numeric values as a categorical column (NaN where numeric or missing)"""
+    return pd.Categorical([None if _is_missing(v) or _is_number(v) else str(v) for v in values])
+
+def indicator_frame(data):
+    """Indicator dict (e.g. get_technical_indicators output) as indicator/value/value_text columns"""
+    names = list(data)
+    values = [data[n] for n in names]
+    return pd.DataFrame({
+        "indicator": pd.Categorical(names),
+        "value": _numeric(values),
+        "value_text": _text(values)
+    })
+
+def comparison_frame(verification_data, ghost_data, pending=False, threshold=DIFF_THRESHOLD):
+    """Typed verification vs GhostScore comparison.
+
+    Columns: indicator (category), verification / ghostscore (float64),
+    verification_text / ghostscore_text (category, non-numeric values
+    only), pct_diff (float64) and status (category of STATUS_LABELS keys).
+    With `pending`, indicators missing from verification are PENDING.
+    """
+    names = list(dict.fromkeys(list(verification_data) + list(ghost_data)))
+    raw_v = [verification_data.get(n) for n in names]
+    raw_g = [ghost_data.get(n) for n in names]
+
+    v_num = _numeric(raw_v)
+    g_num = _numeric(raw_g)
+    v_missing = np.array([_is_missing(v) for v in raw_v], dtype=bool)
+    g_missing = np.array([_is_missing(v) for v in raw_g], dtype=bool)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        diff = v_num - g_num
+        pct_diff = np.where(v_num != 0, diff / v_num * 100, 0.0)
+
+    both_numeric = ~np.isnan(v_num) & ~np.isnan(g_num)
+    significant = both_numeric & (np.abs(pct_diff) > threshold)
+    status = np.full(len(names), NOT_AVAILABLE, dtype=object)
+    status[both_numeric & ~significant] = WITHIN
+    # Direction follows the raw difference (not pct_diff, which flips for negative values)
+    status[significant & (diff > 0)] = ABOVE
+    status[significant & ~(diff > 0)] = BELOW
+
+    other = ~both_numeric & ~v_missing & ~g_missing
+    for i in np.flatnonzero(other):
+        try:
+            status[i] = MATCH if raw_v[i] == raw_g[i] else DIFFERENT
+        except Exception:
+            status[i] = NOT_AVAILABLE
+
+    status[g_missing] = MISSING_GHOSTSCORE
+    status[v_missing] = PENDING if pending else MISSING_VERIFICATION
+
+    frame = pd.DataFrame({
+        "indicator": pd.Categorical(names),
+        "verification": v_num,
+        "ghostscore": g_num,
+        "verification_text": _text(raw_v),
+        "ghostscore_text": _text(raw_g),
+        "pct_diff": np.where(both_numeric, pct_diff, np.nan),
+        "status": pd.Categorical(status, dtype=STATUS_DTYPE)
+    })
+    return frame.sort_values("indicator", key=lambda s: s.astype(str), ignore_index=True)
+
+def status_counts(frame):
+    """{status: rows} including zero counts"""
+    return frame["status"].value_counts().to_dict()
+
+def comparison_display(frame):
+    """Display/CSV view of a comparison frame with the original column names and labels"""
+    labels = frame["status"].map(STATUS_LABELS).astype(object)
+    directional = frame["status"].isin(DIFFERENT_STATUSES).to_numpy()
+    labels[directional] = [
+        f"{label} {abs(pct):.2f}%" for label, pct in zip(labels[directional], frame["pct_diff"][directional])
+    ]
+
+    def merged(numeric, text):
+        # Integral values (volumes, counts) display as ints, as in the raw data
+        numbers = frame[numeric]
+        values = numbers.astype(object)
+        integral = (numbers.notna() & (numbers % 1 == 0)).to_numpy()
+        values[integral] = [int(v) for v in numbers[integral]]
+        has_text = frame[text].notna().to_numpy()
+        values[has_text] = frame[text][has_text].astype(object)
+        return values.where(values.notna(), None)
+
+    return pd.DataFrame({
+        "Indicator": frame["indicator"].astype(str),
+        "Verification App": merged("verification", "verification_text"),
+        "GhostScore Platform": merged("ghostscore", "ghostscore_text"),
+        "Difference": labels
+    })
+
+def scan_frame(rows):
+    """parallel_scan.scan_universe rows as a typed frame"""
+    frame = pd.DataFrame(rows)
+    if frame.empty:
+        return frame
+    frame["ticker"] = frame["ticker"].astype("category")
+    frame["ant_color"] = frame["ant_color"].astype(ANT_COLOR_DTYPE)
+    frame["exploration_score"] = frame["exploration_score"].astype(np.int8)
+    for column in ("param_index", "window", "momentum_threshold"):
+        frame[column] = frame[column].astype(np.int16)
+    for column in ("price_threshold", "volume_threshold"):
+        frame[column] = frame[column].astype(np.float32)
+    for color in ANT_COLORS:
+        frame[f"{color}_ants"] = frame[f"{color}_ants"].astype(np.int32)
+    frame["position"] = frame["position"].astype(np.int32)
+    return frame
@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pytest
+
+# The app is a set of top-level modules rather than an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api_handler  # noqa: E402
+from circuit_breaker import CircuitBreaker  # noqa: E402
+from config import NEGATIVE_CACHE_TTL  # noqa: E402
+from scheduler import KeyBudget, RequestScheduler  # noqa: E402
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        import requests
+
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error", response=self)
+
+    def json(self):
+        return self.data
+
+class FakeTransport:
+    """Stands in for requests.get: queued `responses` first, then `handler(params)`.
+
+    Either may give a FakeResponse (e.g. for an HTTP error status) instead of a payload.
+    """
+
+    def __init__(self):
+        self.responses = []
+        self.handler = None
+        self.calls = []
+
+    def get(self, url, params):
+        self.calls.append(params)
+        data = self.responses.pop(0) if self.responses else self.handler(params)
+        return data if isinstance(data, FakeResponse) else FakeResponse(data)
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    """Route api_handler through a fresh cache, breaker and scheduler and a fake transport"""
+    import requests
+
+    transport = FakeTransport()
+    monkeypatch.setattr(api_handler, "_response_cache", {})
+    monkeypatch.setattr(api_handler, "_last_throttle", [0.0])
+    monkeypatch.setattr(api_handler, "breaker", CircuitBreaker(NEGATIVE_CACHE_TTL, 3, 60))
+    monkeypatch.setattr(api_handler, "_scheduler", RequestScheduler(
+        [KeyBudget("premium", "P", 6000, premium=True)], poll_interval=0.01
+    ))
+    monkeypatch.setattr(requests, "get", transport.get)
+    return transport
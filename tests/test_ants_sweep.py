@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from ants import ANT_COLORS, ant_color_codes
+from ants_sweep import sweep_ants
+
+def make_frame(start, periods, seed, drift=0.004):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(start, periods=periods)
+    return pd.DataFrame({
+        "close": 20 * np.cumprod(1 + rng.normal(drift, 0.03, periods)),
+        "volume": rng.lognormal(13, 0.6, periods)
+    }, index=index)
+
+def expected(frames, window, cutoff, price, volume, horizon):
+    """Per-color counts and mean forward returns from ant_color_codes on each ticker's own bars"""
+    counts, returns = np.zeros(len(ANT_COLORS) + 1, dtype=int), {c: [] for c in range(1, len(ANT_COLORS) + 1)}
+    for frame in frames.values():
+        close = frame["close"].to_numpy()
+        codes = ant_color_codes(close, frame["volume"].to_numpy(), window, cutoff, price, volume)
+        counts += np.bincount(codes, minlength=len(ANT_COLORS) + 1)
+        for pos in np.flatnonzero(codes[:len(close) - horizon]):
+            returns[codes[pos]].append(close[pos + horizon] / close[pos] - 1)
+    return counts[1:], {c: np.mean(r) if r else np.nan for c, r in returns.items()}
+
+def test_sweep_matches_ant_color_codes_across_calendars():
+    # Different lengths and calendars: a long history, a shifted one and a 7-day listing
+    frames = {
+        "LONG": make_frame("2015-01-01", 2500, 1),
+        "SHIFTED": make_frame("2016-06-15", 1200, 2),
+        "NEW": make_frame("2024-03-01", 7, 3)
+    }
+    frames["SHIFTED"] = frames["SHIFTED"].iloc[::2]  # sparse calendar
+    grid = dict(windows=[10, 15], momentum_cutoffs=[8, 12], price_thresholds=[1.1, 1.2],
+                volume_thresholds=[1.0, 1.2])
+    results = sweep_ants(frames, horizon=5, **grid)
+
+    for row in results.itertuples():
+        counts, means = expected(frames, row.window, row.momentum_cutoff, row.price_threshold,
+                                 row.volume_threshold, 5)
+        for i, color in enumerate(ANT_COLORS):
+            assert getattr(row, f"{color}_count") == counts[i]
+            np.testing.assert_allclose(getattr(row, f"{color}_mean_return"), means[i + 1], rtol=1e-5)
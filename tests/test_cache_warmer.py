@@ -0,0 +1,95 @@
+import time
+from collections import defaultdict, deque
+
+import pytest
+
+import api_handler
+import cache_warmer
+from cache_warmer import PENDING, READY, THROTTLED, CacheWarmer
+from conftest import FakeResponse
+
+DAILY = {"Time Series (Daily)": {"2024-01-02": {"1. open": "10", "2. high": "11", "3. low": "9",
+                                                "4. close": "10.5", "5. volume": "1000"}}}
+
+def test_http_429_ends_the_warmer_pass(fake_api):
+    fake_api.responses.append(FakeResponse({}, status_code=429))
+    fake_api.handler = lambda params: DAILY
+    warmer = CacheWarmer(tickers={"Tech": ["MSFT", "AAPL"]}, min_spare=0)
+
+    assert warmer.run_once() is False
+    assert len(fake_api.calls) == 1
+    states = {ticker: info["state"] for ticker, info in warmer.status().items()}
+    assert sorted(states.values()) == [PENDING, THROTTLED]
+
+@pytest.fixture
+def accesses(monkeypatch):
+    """Fresh access history; returns a function recording `n` user accesses of a ticker"""
+    monkeypatch.setattr(api_handler, "_ticker_access", defaultdict(deque))
+
+    def access(ticker, n):
+        for _ in range(n):
+            api_handler._record_access(ticker)
+    return access
+
+def test_warms_hottest_sector_first_then_hottest_tickers(fake_api, accesses):
+    accesses("JPM", 5)
+    accesses("AAPL", 2)
+    accesses("MSFT", 1)
+    warmed = []
+    warmer = CacheWarmer(tickers={"Tech": ["MSFT", "AAPL", "NVDA"], "Finance": ["BAC", "JPM"]},
+                         min_spare=0, warm=lambda ticker: warmed.append(ticker) or True)
+
+    assert warmer.run_once() is True
+    assert warmed == ["JPM", "BAC", "AAPL", "MSFT", "NVDA"]
+    assert {info["state"] for info in warmer._status.values()} == {READY}
+
+class SpareCapacity:
+    """Scheduler stand-in whose spare capacity follows `values`, then stays at the last one"""
+
+    def __init__(self, *values):
+        self.values = list(values)
+        self.checks = 0
+
+    def spare_capacity(self):
+        self.checks += 1
+        return self.values.pop(0) if len(self.values) > 1 else self.values[0]
+
+def test_waits_for_spare_budget_before_each_ticker(fake_api, accesses, monkeypatch):
+    scheduler = SpareCapacity(0.1, 0.9)
+    monkeypatch.setattr(cache_warmer, "get_scheduler", lambda: scheduler)
+    warmed = []
+    warmer = CacheWarmer(tickers={"Tech": ["MSFT"]}, min_spare=0.5,
+                         warm=lambda ticker: warmed.append(ticker) or True)
+
+    start = time.monotonic()
+    assert warmer.run_once() is True
+    assert warmed == ["MSFT"] and scheduler.checks == 2
+    assert time.monotonic() - start >= 0.9  # waited one poll for the budget to free up
+
+def test_stopping_while_waiting_for_budget_warms_nothing(fake_api, accesses, monkeypatch):
+    monkeypatch.setattr(cache_warmer, "get_scheduler", lambda: SpareCapacity(0.0))
+    warmed = []
+    warmer = CacheWarmer(tickers={"Tech": ["MSFT"]}, min_spare=0.5, warm=warmed.append)
+    warmer.stop()
+
+    assert warmer.run_once() is True
+    assert warmed == []
+
+def test_throttle_stops_the_pass_mid_sector(fake_api, accesses):
+    warmed = []
+
+    def warm(ticker):
+        warmed.append(ticker)
+        if ticker == "AAPL":
+            api_handler._last_throttle[0] = time.time()
+        return True
+
+    accesses("MSFT", 3)
+    accesses("AAPL", 2)
+    warmer = CacheWarmer(tickers={"Tech": ["MSFT", "AAPL", "NVDA"], "Finance": ["JPM"]},
+                         min_spare=0, warm=warm)
+
+    assert warmer.run_once() is False
+    assert warmed == ["MSFT", "AAPL"]
+    states = {ticker: info["state"] for ticker, info in warmer._status.items()}
+    assert states == {"MSFT": READY, "AAPL": THROTTLED, "NVDA": PENDING, "JPM": PENDING}
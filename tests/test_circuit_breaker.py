@@ -0,0 +1,96 @@
+import time
+
+import pytest
+import api_handler
+from circuit_breaker import (CLOSED, HALF_OPEN, INVALID_SYMBOL, OPEN, SERVER_ERROR, THROTTLE, TRANSIENT,
+                             UNAVAILABLE, CircuitBreaker)
+
+TTLS = {INVALID_SYMBOL: 60, THROTTLE: 60, TRANSIENT: 0, SERVER_ERROR: 0, UNAVAILABLE: 60}
+PREMIUM_NOTICE = {"Information": "Thank you for using Alpha Vantage! This is a premium endpoint."}
+
+def test_breaker_open_half_open_close():
+    breaker = CircuitBreaker(TTLS, failure_threshold=2, cooldown=0.05)
+    breaker.record_failure("MSFT", "SMA", TRANSIENT)
+    assert breaker.state("MSFT", "SMA") == CLOSED
+    breaker.record_failure("MSFT", "SMA", TRANSIENT)
+    assert breaker.state("MSFT", "SMA") == OPEN
+    assert breaker.blocked("MSFT", "SMA") == OPEN
+
+    time.sleep(0.06)
+    assert breaker.state("MSFT", "SMA") == HALF_OPEN
+    assert breaker.blocked("MSFT", "SMA") is None  # the trial call
+    assert breaker.blocked("MSFT", "SMA") == OPEN  # only one trial at a time
+
+    breaker.record_success("MSFT", "SMA")
+    assert breaker.state("MSFT", "SMA") == CLOSED
+    assert breaker.blocked("MSFT", "SMA") is None
+
+def test_failed_trial_reopens():
+    breaker = CircuitBreaker(TTLS, failure_threshold=1, cooldown=0.05)
+    breaker.record_failure("MSFT", "SMA", SERVER_ERROR)
+    time.sleep(0.06)
+    assert breaker.blocked("MSFT", "SMA") is None
+    breaker.record_failure("MSFT", "SMA", SERVER_ERROR)
+    assert breaker.state("MSFT", "SMA") == OPEN
+
+def test_throttles_never_trip_the_breaker():
+    breaker = CircuitBreaker(TTLS, failure_threshold=1, cooldown=60)
+    breaker.record_failure("MSFT", "SMA", THROTTLE)
+    assert breaker.state("MSFT", "SMA") == CLOSED
+    assert breaker.blocked("MSFT", "SMA") == THROTTLE  # negatively cached only
+
+def test_invalid_symbol_blocks_every_endpoint():
+    breaker = CircuitBreaker(TTLS)
+    breaker.record_failure("NOPE", "SMA", INVALID_SYMBOL)
+    assert breaker.blocked("NOPE", "RSI") == INVALID_SYMBOL
+
+@pytest.mark.parametrize("data, expected", [
+    ({"Time Series (Daily)": {"2024-01-02": {}}}, None),
+    ({"Note": "Thank you for using Alpha Vantage! Our standard API call frequency is 5 calls per minute"}, THROTTLE),
+    ({"Error Message": "Invalid API call."}, INVALID_SYMBOL),
+    ({}, INVALID_SYMBOL),
+    (PREMIUM_NOTICE, UNAVAILABLE),
+    ({"Meta Data": {}}, SERVER_ERROR),
+    ([], SERVER_ERROR)
+])
+def test_classify_response(data, expected):
+    assert api_handler.classify_response(data, "TIME_SERIES_DAILY") == expected
+
+def test_premium_notice_is_a_failure_and_not_cached(fake_api):
+    fake_api.responses.append(PREMIUM_NOTICE)
+    assert api_handler.get_alpha_vantage_data("MSFT", outputsize="full") is None
+    assert api_handler._response_cache == {}
+    assert api_handler.breaker.blocked("MSFT", "TIME_SERIES_DAILY (premium)") == UNAVAILABLE
+    # The premium-only variant failing does not block the basic call
+    assert api_handler.breaker.blocked("MSFT", "TIME_SERIES_DAILY") is None
+
+def test_valid_response_is_cached(fake_api):
+    data = {"Time Series (Daily)": {"2024-01-02": {"4. close": "1"}}}
+    fake_api.responses.append(data)
+    assert api_handler.get_alpha_vantage_data("MSFT") == data
+    assert api_handler.get_alpha_vantage_data("MSFT") == data  # served from the cache
+    assert len(fake_api.calls) == 1
+
+@pytest.mark.parametrize("function, data, expected", [
+    ("GLOBAL_QUOTE", {"Global Quote": {"05. price": "1"}}, None),
+    ("TIME_SERIES_DAILY_ADJUSTED", {"Time Series (Daily)": {}}, None),
+    ("NEWS_SENTIMENT", {"feed": []}, None),  # data key not known, so not checked
+    ("RSI", {"Meta Data": {}}, SERVER_ERROR),
+    ("RSI", {"Error Message": "Invalid API call."}, UNAVAILABLE),
+    ("MACDEXT", {}, UNAVAILABLE)
+])
+def test_classify_response_by_function(function, data, expected):
+    assert api_handler.classify_response(data, function) == expected
+
+def test_indicator_error_blocks_only_its_endpoint(fake_api):
+    fake_api.responses.append({"Error Message": "Invalid API call."})
+    assert api_handler.get_alpha_vantage_data("MSFT", function="RSI", interval="daily") is None
+    assert api_handler.breaker.blocked("MSFT", "RSI") == UNAVAILABLE
+    assert api_handler.breaker.blocked("MSFT", "TIME_SERIES_DAILY") is None
+
+def test_generic_function_response_is_cached(fake_api):
+    data = {"Global Quote": {"05. price": "1"}}
+    fake_api.responses.append(data)
+    assert api_handler.get_alpha_vantage_data("MSFT", function="GLOBAL_QUOTE") == data
+    assert api_handler.get_alpha_vantage_data("MSFT", function="GLOBAL_QUOTE") == data
+    assert len(fake_api.calls) == 1
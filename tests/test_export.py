@@ -0,0 +1,71 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from export import ANTS_SCAN, SNAPSHOTS, VERIFICATION, DatasetWriter, frame_bytes, read_export, with_partitions
+from materialize import snapshot_frame
+from schema import comparison_frame, scan_frame
+
+pytest.importorskip("pyarrow")
+
+def snapshot_batch(ticker, data):
+    frame = snapshot_frame(ticker, "2024-01-05", {"data": data})
+    frame["ticker"] = frame["ticker"].astype("category")
+    return frame
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_batches_with_and_without_text_share_one_schema(tmp_path, format):
+    writer = DatasetWriter(SNAPSHOTS, run_date="2024-01-05", root=tmp_path, format=format)
+    writer.write(snapshot_batch("MSFT", {"Close": 1.0, "ma15": 2.0}))  # value_text all null
+    writer.write(snapshot_batch("JPM", {"Close": 3.0, "trend": "up"}))
+    writer.write(snapshot_batch("ZZZZ", {"Close": 4.0}), sector="Other")
+
+    frame = read_export(SNAPSHOTS, root=tmp_path, format=format)
+    assert len(frame) == 5 and writer.rows == 5 and writer.batches == 3
+    assert isinstance(frame["value_text"].dtype, pd.CategoricalDtype)
+    assert isinstance(frame["indicator"].dtype, pd.CategoricalDtype)
+    assert frame["value"].dtype == np.float64
+    assert frame.loc[frame["indicator"] == "trend", "value_text"].tolist() == ["up"]
+
+def test_read_selects_columns_and_partitions(tmp_path):
+    writer = DatasetWriter(VERIFICATION, run_date="2024-01-05", root=tmp_path)
+    for ticker in ("MSFT", "JPM"):
+        frame = comparison_frame({"ma15": 1.0}, {"ma15": 1.5})
+        frame.insert(0, "ticker", pd.Categorical([ticker]))
+        writer.write(frame)
+    DatasetWriter(VERIFICATION, run_date="2024-01-08", root=tmp_path).write(frame)
+
+    frame = read_export(VERIFICATION, columns=["ticker", "status"], run_dates=["2024-01-05"],
+                        sectors=["Finance"], root=tmp_path)
+    assert list(frame.columns) == ["ticker", "status"]
+    assert frame["ticker"].astype(str).tolist() == ["JPM"]
+    assert frame["status"].astype(str).tolist() == ["below"]
+
+def test_scan_round_trip_keeps_types(tmp_path):
+    row = {"ticker": "MSFT", "param_index": 0, "window": 15, "momentum_threshold": 12,
+           "price_threshold": 1.2, "volume_threshold": 1.2, "position": 10, "ant_color": "green",
+           "exploration_score": 6, "gray_ants": 1, "yellow_ants": 2, "blue_ants": 3, "green_ants": 4,
+           "date": pd.Timestamp("2024-01-05")}
+    DatasetWriter(ANTS_SCAN, root=tmp_path).write(scan_frame([row, {**row, "ant_color": None}]))
+
+    frame = read_export(ANTS_SCAN, root=tmp_path)
+    assert frame["ant_color"].cat.categories.tolist() == ["gray", "yellow", "blue", "green"]
+    assert frame["ant_color"].cat.ordered
+    assert frame["exploration_score"].dtype == np.int8 and frame["window"].dtype == np.int16
+
+def test_frame_bytes_uses_the_dataset_schema():
+    frame = with_partitions(comparison_frame({"Volume": 10}, {"Volume": 10}).assign(ticker="MSFT"))
+    table = pd.read_parquet(io.BytesIO(frame_bytes(frame, VERIFICATION, "parquet")))
+    assert isinstance(table["verification_text"].dtype, pd.CategoricalDtype)
+    with pytest.raises(ValueError):
+        frame_bytes(frame.drop(columns="status"), VERIFICATION)
+
+def test_formats_are_kept_apart(tmp_path):
+    for format, ticker in (("parquet", "MSFT"), ("arrow", "JPM")):
+        DatasetWriter(SNAPSHOTS, run_date="2024-01-05", root=tmp_path, format=format).write(
+            snapshot_batch(ticker, {"Close": 1.0}))
+
+    assert read_export(SNAPSHOTS, root=tmp_path)["ticker"].astype(str).tolist() == ["MSFT"]
+    assert read_export(SNAPSHOTS, root=tmp_path, format="arrow")["ticker"].astype(str).tolist() == ["JPM"]
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from ants import ANT_COLORS, DEFAULT_ANTS_PARAMS, ant_color_codes, ants_score_arrays
+from parallel_scan import scan_universe, verify_universe
+
+def make_frame(start, periods, seed, drift=0.006):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(start, periods=periods)
+    return pd.DataFrame({
+        "close": 20 * np.cumprod(1 + rng.normal(drift, 0.03, periods)),
+        "volume": rng.lognormal(13, 0.6, periods)
+    }, index=index)
+
+# Different lengths and start dates; dict order is deliberately not sorted
+FRAMES = {
+    "MSFT": make_frame("2020-01-01", 300, 1),
+    "AAPL": make_frame("2019-06-03", 420, 2),
+    "NVDA": make_frame("2020-03-02", 90, 3)
+}
+PARAM_SETS = [{}, {"window": 10, "momentum_threshold": 7, "price_threshold": 1.1}]
+SNAPSHOTS = list(pd.to_datetime(["2020-01-31", "2020-06-30", "2020-12-31"]))
+
+def test_scan_universe_order_and_values_match_ants():
+    scan = scan_universe(FRAMES, PARAM_SETS, snapshots=SNAPSHOTS, workers=2)
+
+    expected_rows = []
+    for ticker in FRAMES:
+        frame = FRAMES[ticker]
+        close, volume = frame["close"].to_numpy(), frame["volume"].to_numpy()
+        positions = frame.index.searchsorted(SNAPSHOTS, side="right") - 1
+        for param_index, params in enumerate(PARAM_SETS):
+            params = {**DEFAULT_ANTS_PARAMS, **params}
+            codes = ant_color_codes(close, volume, **params)
+            *_, score = ants_score_arrays(close, volume, period=params["window"],
+                                          momentum_threshold=params["momentum_threshold"],
+                                          price_threshold=params["price_threshold"],
+                                          volume_threshold=params["volume_threshold"])
+            for pos in positions[positions >= 0]:
+                expected_rows.append((ticker, param_index, pos, frame.index[pos], codes[pos], score[pos],
+                                      np.bincount(codes[:pos + 1], minlength=len(ANT_COLORS) + 1)[1:]))
+
+    # Rows follow the input ticker order; the categories are sorted
+    assert list(scan["ticker"].cat.categories) == sorted(FRAMES)
+    assert len(scan) == len(expected_rows)
+    for row, (ticker, param_index, pos, day, code, score, counts) in zip(scan.itertuples(), expected_rows):
+        assert (row.ticker, row.param_index, row.position, row.date) == (ticker, param_index, pos, day)
+        assert (pd.isna(row.ant_color) if code == 0 else row.ant_color == ANT_COLORS[code - 1])
+        assert row.exploration_score == score
+        assert [getattr(row, f"{color}_ants") for color in ANT_COLORS] == list(counts)
+
+def test_scan_counts_only_bars_up_to_the_snapshot():
+    scan = scan_universe(FRAMES, snapshots=SNAPSHOTS, workers=2)
+    early = scan[(scan["ticker"] == "MSFT") & (scan["date"] <= "2020-01-31")].iloc[0]
+    total = sum(early[f"{color}_ants"] for color in ANT_COLORS)
+    assert total <= early["position"] + 1
+
+    # Counts never shrink from one snapshot to the next
+    counts = scan[scan["ticker"] == "AAPL"][[f"{color}_ants" for color in ANT_COLORS]].to_numpy()
+    assert (np.diff(counts, axis=0) >= 0).all()
+
+def test_verify_universe_uses_last_bar_in_ticker_order():
+    ghost = {ticker: {"Close-1": float(frame["close"].iloc[-2]), "ma15": 0.0}
+             for ticker, frame in FRAMES.items()}
+    report = verify_universe(ghost, FRAMES, workers=2)
+
+    assert list(report["ticker"]) == [t for t in FRAMES for _ in range(2)]
+    closes = report[report["indicator"] == "Close-1"]
+    assert list(closes["status"]) == ["within"] * len(FRAMES)
+    ma = report[report["indicator"] == "ma15"]
+    np.testing.assert_allclose(ma["verification"], [f["close"].iloc[-15:].mean() for f in FRAMES.values()])
@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from scheduler import (BATCH, INTERACTIVE, PREFETCH, DeadlineExceeded, KeyBudget, RequestCancelled,
+                       RequestScheduler)
+
+def make_scheduler(*budgets, **kwargs):
+    kwargs.setdefault("poll_interval", 0.01)
+    return RequestScheduler(list(budgets), **kwargs)
+
+def saturate(scheduler):
+    """Use up the first key so further callers have to queue"""
+    scheduler.acquire(INTERACTIVE)
+
+def test_priority_order():
+    scheduler = make_scheduler(KeyBudget("premium", "P", 300))  # one call per 0.2 s
+    saturate(scheduler)
+    granted = []
+
+    def request(priority):
+        scheduler.acquire(priority, owner=f"owner-{priority}")
+        granted.append(priority)
+
+    threads = []
+    for priority in (PREFETCH, BATCH, INTERACTIVE):  # queued lowest priority first
+        threads.append(threading.Thread(target=request, args=(priority,)))
+        threads[-1].start()
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert granted == [INTERACTIVE, BATCH, PREFETCH]
+
+def test_fair_queuing_within_class():
+    scheduler = make_scheduler(KeyBudget("premium", "P", 600))  # one call per 0.1 s
+    saturate(scheduler)
+    granted = []
+
+    def request(owner):
+        scheduler.acquire(BATCH, owner=owner)
+        granted.append(owner)
+
+    threads = []
+    for owner in ("big", "big", "big", "small"):
+        threads.append(threading.Thread(target=request, args=(owner,)))
+        threads[-1].start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert granted.index("small") < 2
+
+def test_cancel_releases_waiter():
+    scheduler = make_scheduler(KeyBudget("free", "F", 1))
+    saturate(scheduler)
+    cancel = threading.Event()
+    errors = []
+
+    def request():
+        try:
+            scheduler.acquire(BATCH, cancel_event=cancel)
+        except RequestCancelled as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=request)
+    thread.start()
+    time.sleep(0.05)
+    cancel.set()
+    thread.join(timeout=1)
+
+    assert not thread.is_alive() and len(errors) == 1
+    assert scheduler.queue_depth()["batch"] == 0
+
+def test_deadline_exceeded():
+    scheduler = make_scheduler(KeyBudget("free", "F", 1))
+    saturate(scheduler)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        scheduler.acquire(BATCH, deadline=time.monotonic() + 0.05)
+    assert time.monotonic() - start < 1
+
+def test_reserve_keeps_prefetch_off_the_last_calls():
+    budget = KeyBudget("free", "F", 10)
+    scheduler = make_scheduler(budget)
+    now = time.monotonic()
+    for i in range(7):  # 70% used: the prefetch reserve (30%) is all that is left
+        budget.consume(now - 59 + i * 0.1)
+    with pytest.raises(DeadlineExceeded):
+        scheduler.acquire(PREFETCH, deadline=time.monotonic() + 0.05)
+    assert scheduler.acquire(INTERACTIVE) == "F"
+
+def test_waits_for_preferred_key_instead_of_spilling():
+    scheduler = make_scheduler(KeyBudget("premium", "P", 150, premium=True), KeyBudget("free", "F", 5))
+    keys = [scheduler.acquire(BATCH) for _ in range(4)]  # 0.4 s spacing on the premium key
+    assert keys == ["P"] * 4
+
+def test_falls_back_when_preferred_key_is_exhausted():
+    scheduler = make_scheduler(KeyBudget("premium", "P", 2, premium=True), KeyBudget("free", "F", 5),
+                               fallback_wait=1.0)
+    assert scheduler.acquire(BATCH) == "P"
+    assert scheduler.acquire(BATCH) == "F"
+
+def test_premium_requests_never_use_free_keys():
+    scheduler = make_scheduler(KeyBudget("premium", "P", 2, premium=True), KeyBudget("free", "F", 5))
+    assert scheduler.acquire(BATCH, premium=True) == "P"
+    with pytest.raises(DeadlineExceeded):
+        scheduler.acquire(BATCH, premium=True, deadline=time.monotonic() + 0.05)
+    assert scheduler.acquire(BATCH) == "F"
+
+def test_spare_capacity_is_weighted_by_rate():
+    premium, free = KeyBudget("premium", "P", 150), KeyBudget("free", "F", 5)
+    scheduler = make_scheduler(premium, free)
+    assert scheduler.spare_capacity() == 1.0
+
+    now = time.monotonic()
+    for i in range(150):  # premium key saturated, free key idle
+        premium.consume(now - 30 + i * 0.1)
+    assert scheduler.spare_capacity() < 0.05
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+
+from schema import (ABOVE, BELOW, MISSING_GHOSTSCORE, MISSING_VERIFICATION, WITHIN, comparison_display,
+                    comparison_frame, status_counts)
+
+VERIFICATION = {
+    "Close": 101.0, "Volume": 12345678, "macdCount": 2, "macdDaily": -2.0, "macdWeekly": -2.0,
+    "ma15": 100.0, "rsi14": 0.0, "aroonUp": 50.0, "label": "up", "other": "x", "onlyHere": 3.5,
+    "missingValue": None
+}
+GHOST = {
+    "Close": 100.5, "Volume": 12345678, "macdCount": 3, "macdDaily": -2.5, "macdWeekly": -1.5,
+    "ma15": 100.0, "rsi14": 5.0, "aroonUp": 50.4, "label": "up", "other": "y", "onlyThere": 7,
+    "missingValue": 1.0
+}
+
+def highlight_diff(row):
+    """The baseline app's per-row comparison"""
+    try:
+        val1 = row["Verification App"]
+        val2 = row["GhostScore Platform"]
+
+        if pd.isna(val1):
+            return "🔴 Missing in Verification"
+        if pd.isna(val2):
+            return "🔵 Missing in GhostScore"
+
+        if isinstance(val1, (int, float)) and isinstance(val2, (int, float)):
+            diff = val1 - val2
+            pct_diff = (diff / val1) * 100 if val1 != 0 else 0
+
+            if abs(pct_diff) > 1.0:  # 1% threshold
+                direction = "🔺" if diff > 0 else "🔻"
+                return f"{direction} {abs(pct_diff):.2f}%"
+            return "✅ Within 1%"
+
+        return "✅ Match" if val1 == val2 else "⚠️ Different"
+
+    except Exception:
+        return "⚪ N/A"
+
+def baseline_comparison(verification, ghost):
+    comparison = pd.merge(
+        pd.DataFrame(list(verification.items()), columns=["Indicator", "Verification App"]),
+        pd.DataFrame(list(ghost.items()), columns=["Indicator", "GhostScore Platform"]),
+        on="Indicator", how="outer"
+    )
+    comparison["Difference"] = comparison.apply(highlight_diff, axis=1)
+    return comparison.set_index("Indicator")
+
+def test_status_parity_with_highlight_diff():
+    expected = baseline_comparison(VERIFICATION, GHOST)["Difference"]
+    display = comparison_display(comparison_frame(VERIFICATION, GHOST)).set_index("Indicator")
+    assert display["Difference"].to_dict() == expected.to_dict()
+
+def test_negative_values_keep_the_direction_of_the_difference():
+    frame = comparison_frame({"macd": -2.0, "ma": 2.0}, {"macd": -2.5, "ma": 2.5}).set_index("indicator")
+    assert frame.loc["macd", "status"] == ABOVE
+    assert frame.loc["ma", "status"] == BELOW
+
+def test_integral_values_display_as_ints():
+    display = comparison_display(comparison_frame(VERIFICATION, GHOST)).set_index("Indicator")
+    assert display.loc["Volume", "Verification App"] == 12345678
+    assert isinstance(display.loc["macdCount", "GhostScore Platform"], int)
+    assert display.loc["Close", "Verification App"] == 101.0
+    assert display.loc["label", "Verification App"] == "up"
+    csv = comparison_display(comparison_frame({"Volume": 12345678}, {"Volume": 2})).to_csv(index=False)
+    assert csv.splitlines()[1].startswith("Volume,12345678,2,")
+
+def test_comparison_frame_is_typed():
+    frame = comparison_frame(VERIFICATION, GHOST)
+    assert isinstance(frame["status"].dtype, pd.CategoricalDtype)
+    assert frame["verification"].dtype == np.float64
+    counts = status_counts(frame)
+    assert counts[WITHIN] == 5 and counts[MISSING_GHOSTSCORE] == 1 and counts[MISSING_VERIFICATION] == 2
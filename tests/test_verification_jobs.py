@@ -0,0 +1,60 @@
+import time
+
+import api_handler
+from scheduler import INTERACTIVE, KeyBudget, RequestScheduler
+from verification_jobs import CANCELLED, DONE, PRICE_STAGE, VerificationJobs
+
+BAR = {"1. open": "10", "2. high": "11", "3. low": "9", "4. close": "10.5", "5. volume": "1000"}
+
+def alpha_vantage(params):
+    """Minimal valid payload for every function the verification stages call"""
+    function = params["function"]
+    if function == "TIME_SERIES_DAILY":
+        return {"Time Series (Daily)": {f"2024-01-{d:02d}": BAR for d in range(30, 0, -1)}}
+    if function == "TIME_SERIES_WEEKLY":
+        return {"Weekly Time Series": {"2024-01-05": BAR}}
+    values = {"SMA": "10", "Aroon Up": "50", "Aroon Down": "50", "MFI": "40", "RSI": "55",
+              "MACD": "1", "MACD_Signal": "0.5"}
+    return {f"Technical Analysis: {function}": {"2024-01-30": values, "2024-01-29": values,
+                                                "2024-01-28": values}}
+
+def wait_until_done(job, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not job.done and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.done
+
+def test_switching_away_while_prices_are_queued_resumes_cleanly(fake_api, monkeypatch):
+    fake_api.handler = alpha_vantage
+    slow = RequestScheduler([KeyBudget("free", "F", 2)], poll_interval=0.01)
+    slow.acquire(INTERACTIVE)  # the next slot is 30 s away, so the price stage queues
+    monkeypatch.setattr(api_handler, "_scheduler", slow)
+
+    jobs = VerificationJobs()
+    first = jobs.select("MSFT")
+    time.sleep(0.05)
+    other = jobs.select("AAPL")  # cancels the queued MSFT job
+    wait_until_done(first)
+    assert first.stage_states()[PRICE_STAGE] == CANCELLED
+    assert not first.failed
+    assert first.completed_stages() == {}
+    other.cancel()
+
+    monkeypatch.setattr(api_handler, "_scheduler", RequestScheduler(
+        [KeyBudget("premium", "P", 6000)], poll_interval=0.01
+    ))
+    resumed = jobs.select("MSFT")
+    assert resumed is not first
+    wait_until_done(resumed)
+    assert not resumed.failed
+    assert set(resumed.stage_states().values()) == {DONE}
+    assert resumed.data()["Close"] == 10.5
+
+def test_empty_price_stage_fails_without_fetching_indicators(fake_api):
+    fake_api.handler = lambda params: {"Error Message": "Invalid API call."}
+    job = VerificationJobs().select("NOPE")
+    wait_until_done(job)
+    assert job.failed
+    assert PRICE_STAGE not in job.completed_stages()
+    assert len(fake_api.calls) == 1
+    assert set(state for name, state in job.stage_states().items() if name != PRICE_STAGE) == {CANCELLED}
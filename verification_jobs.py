@@ -0,0 +1,188 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from api_handler import INDICATOR_STAGES, get_ohlcv_data
+from config import CACHE_EXPIRATION
+from scheduler import INTERACTIVE, RequestCancelled, request_context
+
+# The OHLCV stage comes first so the comparison has prices as early as possible
+PRICE_STAGE = "OHLCV"
+STAGES = [(PRICE_STAGE, lambda ticker: get_ohlcv_data(ticker) or {})] + INDICATOR_STAGES
+
+# Stage results to report while a job runs
+PENDING, RUNNING, DONE, FAILED, CANCELLED = "pending", "running", "done", "failed", "cancelled"
+
+class VerificationJob:
+    """Background verification of one ticker, filled in stage by stage.
+
+    The price stage runs first; only once it has data are the indicator
+    stages started, concurrently at interactive priority. Results are
+    merged as each stage finishes so the UI can render partial comparisons.
+    cancel() drops stages that have not started and makes in-flight ones
+    give up their scheduler slot. Finished stages from a previous job can
+    be passed in as `completed` to resume instead of refetching; stages
+    that were cancelled or failed are never kept as finished.
+    """
+
+    def __init__(self, ticker, source="alpha_vantage", completed=None, max_workers=4):
+        self.ticker = ticker
+        self.source = source
+        self.created = time.time()
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._data = {}
+        self._states = {name: PENDING for name, _ in STAGES}
+        self._stage_data = {}
+        for name, values in (completed or {}).items():
+            self._data.update(values)
+            self._states[name] = DONE
+            self._stage_data[name] = values
+
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix=f"verify-{ticker}")
+        self._futures = []
+        if self._states[PRICE_STAGE] == DONE:
+            self._start_indicators()
+        else:
+            self._futures.append(self._pool.submit(self._run_price_stage))
+
+    @classmethod
+    def from_data(cls, ticker, source, data):
+        """A finished job wrapping precomputed data (e.g. a materialized snapshot)"""
+        job = cls.__new__(cls)
+        job.ticker, job.source, job.created = ticker, source, time.time()
+        job._lock = threading.Lock()
+        job._cancel = threading.Event()
+        job._data = dict(data)
+        job._states = {name: DONE for name, _ in STAGES}
+        job._stage_data = {PRICE_STAGE: job._data}
+        job._futures = []
+        return job
+
+    def _run_price_stage(self):
+        try:
+            self._run_stage(PRICE_STAGE, STAGES[0][1])
+            with self._lock:
+                state = self._states[PRICE_STAGE]
+                if state != DONE:
+                    # Without prices there is nothing to verify; spend no budget on indicators
+                    for name in self._states:
+                        if self._states[name] == PENDING:
+                            self._states[name] = CANCELLED
+            if state == DONE:
+                self._start_indicators()
+        finally:
+            self._pool.shutdown(wait=False)
+
+    def _start_indicators(self):
+        with self._lock:
+            if not self._cancel.is_set():
+                self._futures.extend(
+                    self._pool.submit(self._run_stage, name, stage)
+                    for name, stage in STAGES if self._states[name] == PENDING
+                )
+        self._pool.shutdown(wait=False)
+
+    def _run_stage(self, name, stage):
+        if self._cancel.is_set():
+            return
+        with self._lock:
+            self._states[name] = RUNNING
+        try:
+            with request_context(INTERACTIVE, owner=f"ui:{self.ticker}", cancel_event=self._cancel):
+                values = stage(self.ticker)
+            state = DONE
+        except RequestCancelled:
+            values, state = {}, CANCELLED
+        except Exception as e:
+            print(f"Error in {name} stage for {self.ticker}: {str(e)}")
+            values, state = {}, FAILED
+
+        with self._lock:
+            if self._cancel.is_set():
+                state = CANCELLED  # a stage cut short by cancel() may hold partial results
+            elif state == DONE and name == PRICE_STAGE and not values:
+                state = FAILED
+            self._states[name] = state
+            if state == DONE:
+                self._data.update(values)
+                self._stage_data[name] = values
+
+    def cancel(self):
+        self._cancel.set()
+        with self._lock:
+            for future in self._futures:
+                future.cancel()
+            for name, state in self._states.items():
+                if state == PENDING:
+                    self._states[name] = CANCELLED
+
+    @property
+    def done(self):
+        with self._lock:
+            return all(state not in (PENDING, RUNNING) for state in self._states.values())
+
+    @property
+    def failed(self):
+        """True once the price stage has finished without data"""
+        with self._lock:
+            return self._states[PRICE_STAGE] == FAILED
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def data(self):
+        """Indicators received so far"""
+        with self._lock:
+            return dict(self._data)
+
+    def completed_stages(self):
+        """{stage name: indicators} of finished stages, for resuming"""
+        with self._lock:
+            return dict(self._stage_data)
+
+    def progress(self):
+        """(finished stages, total stages)"""
+        with self._lock:
+            finished = sum(1 for state in self._states.values() if state not in (PENDING, RUNNING))
+            return finished, len(self._states)
+
+    def stage_states(self):
+        with self._lock:
+            return dict(self._states)
+
+class VerificationJobs:
+    """Per-session registry: one active job, finished work kept per (ticker, source)"""
+
+    def __init__(self, ttl=CACHE_EXPIRATION, snapshot_lookup=None):
+        self.ttl = ttl
+        self.snapshot_lookup = snapshot_lookup
+        self._jobs = {}
+        self._active = None
+
+    def select(self, ticker, source="alpha_vantage"):
+        """Job for the selected ticker; cancels the previously selected one if still running"""
+        key = (ticker, source)
+        if self._active and self._active != key:
+            previous = self._jobs.get(self._active)
+            if previous and not previous.done:
+                previous.cancel()
+        self._active = key
+
+        job = self._jobs.get(key)
+        expired = job is not None and time.time() - job.created > self.ttl
+        if job is None or expired or job.cancelled or job.failed:
+            # Resume cancelled or failed jobs from their finished stages; start expired ones afresh
+            job = self._start(ticker, source, None if expired else job)
+            self._jobs[key] = job
+        return job
+
+    def _start(self, ticker, source, previous):
+        if self.snapshot_lookup:
+            data = self.snapshot_lookup(ticker)
+            if data:
+                return VerificationJob.from_data(ticker, source, data)
+        completed = previous.completed_stages() if previous else None
+        return VerificationJob(ticker, source, completed=completed)